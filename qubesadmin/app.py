@@ -23,6 +23,9 @@ Main Qubes() class and related classes.
 """
 from __future__ import annotations
 
+import concurrent.futures
+import contextlib
+import errno
 import grp
 import io
 import os
@@ -33,6 +36,7 @@ import subprocess
 import sys
 
 import logging
+import operator
 import typing
 from logging import Logger
 from typing import TypeVar, IO
@@ -223,7 +227,9 @@ class QubesBase(qubesadmin.base.PropertyHolder):
         super().__init__(self, "admin.property.", "dom0")
         self.domains = VMCollection(self)
         self.labels = qubesadmin.base.WrapperObjectsCollection(
-            self, "admin.label.List", qubesadmin.label.Label
+            self, "admin.label.List", qubesadmin.label.Label,
+            full_list_method="admin.label.ListFull",
+            parse_line=qubesadmin.label.parse_list_full_line,
         )
         self.pools = qubesadmin.base.WrapperObjectsCollection(
             self, "admin.pool.List", qubesadmin.storage.Pool
@@ -232,6 +238,14 @@ class QubesBase(qubesadmin.base.PropertyHolder):
         self._pool_drivers: dict[str, list[str]] | None = None
         self.log = logging.getLogger("app")
         self._local_name = None
+        #: calls queued by :py:meth:`PropertyHolder.qubesd_call_async`,
+        # waiting for :py:meth:`flush_pending`
+        self._pending_calls: list[
+            tuple[str, str, str | None, bytes | None,
+                  concurrent.futures.Future[bytes]]] = []
+        #: optional methods refused by qubesd (for example by qrexec policy),
+        # not to be tried again
+        self._refused_methods: set[str] = set()
 
     def list_vmclass(self) -> list[Klass]:
         """Call Qubesd in order to obtain the vm classes list"""
@@ -470,7 +484,8 @@ class QubesBase(qubesadmin.base.PropertyHolder):
 
         if pool is None and pools is None:
             # use the same pools as the source - check if non default is used
-            for volume in sorted(src_vm.volumes.values()):
+            for volume in sorted(src_vm.volumes.values(),
+                                 key=operator.attrgetter("sort_key")):
                 if volume.snap_on_start or not volume.rw:
                     # also see qubes.vm.qubesvm._patch_pool_config()
                     continue
@@ -629,7 +644,8 @@ class QubesBase(qubesadmin.base.PropertyHolder):
                 raise
 
         try:
-            for dst_volume in sorted(dst_vm.volumes.values()):
+            for dst_volume in sorted(dst_vm.volumes.values(),
+                                     key=operator.attrgetter("sort_key")):
                 if not dst_volume.save_on_stop:
                     # clone only persistent volumes
                     continue
@@ -686,6 +702,86 @@ class QubesBase(qubesadmin.base.PropertyHolder):
             "class: qubesadmin.Qubes()"
         )
 
+    def flush_pending(self) -> None:
+        """
+        Send calls queued with
+        :py:meth:`qubesadmin.base.PropertyHolder.qubesd_call_async` and
+        resolve their futures.
+
+        All the calls are sent in a single `admin.batch.Execute` call. Its
+        payload consists of one entry per call: entry length (decimal),
+        NUL, then `method+arg dest` header, NUL and the call payload. The
+        response holds one qubesd response per entry, in the same order and
+        framed the same way. If qubesd refuses the batch call, the queued
+        calls are made one by one instead.
+        """
+        pending, self._pending_calls = self._pending_calls, []
+        if not pending:
+            return
+        request = bytearray()
+        for dest, method, arg, payload, _ in pending:
+            entry = "{}+{} {}\0".format(method, arg or "", dest).encode(
+                "ascii") + (payload or b"")
+            request += b"%d\0" % len(entry)
+            request += entry
+        try:
+            response = self.qubesd_call(
+                "dom0", "admin.batch.Execute", None, bytes(request))
+        except qubesadmin.exc.QubesDaemonAccessError:
+            for index, (dest, method, arg, payload, future) in \
+                    enumerate(pending):
+                try:
+                    future.set_result(
+                        self.qubesd_call(dest, method, arg, payload))
+                except qubesadmin.exc.QubesException as e:
+                    future.set_exception(e)
+                except BaseException as e:
+                    # do not leave anyone waiting for the remaining calls
+                    for *_, unsent_future in pending[index:]:
+                        unsent_future.set_exception(e)
+                    raise
+            return
+        except BaseException as e:
+            for *_, future in pending:
+                future.set_exception(e)
+            raise
+        offset = 0
+        for *_, future in pending:
+            try:
+                sep = response.index(b"\0", offset)
+                offset = sep + 1 + int(response[offset:sep])
+            except ValueError:
+                future.set_exception(
+                    qubesadmin.exc.QubesDaemonCommunicationError(
+                        "Truncated batch response"))
+                continue
+            try:
+                future.set_result(
+                    self._parse_qubesd_response(response[sep + 1:offset]))
+            except qubesadmin.exc.QubesException as e:
+                future.set_exception(e)
+
+    @contextlib.contextmanager
+    def batching(self) -> Generator[None, None, None]:
+        """
+        Context manager sending calls queued inside it (see
+        :py:meth:`flush_pending`) when leaving the block. If the block
+        raises an exception, queued calls are cancelled instead.
+
+        >>> with app.batching():
+        ...     states = {
+        ...         vm: vm.qubesd_call_async(None, 'admin.vm.CurrentState')
+        ...         for vm in app.domains}
+        """
+        try:
+            yield
+        except BaseException:
+            pending, self._pending_calls = self._pending_calls, []
+            for *_, future in pending:
+                future.cancel()
+            raise
+        self.flush_pending()
+
     def run_service(
         self,
         dest: str,
@@ -718,6 +814,36 @@ class QubesBase(qubesadmin.base.PropertyHolder):
             "class: qubesadmin.Qubes()"
         )
 
+    @staticmethod
+    def _copy_stream(src: IO, dst: IO) -> None:
+        """Copy the rest of *src* to *dst*.
+
+        When *src* is a regular file, data is passed with :py:func:`os.sendfile`
+        without copying it through user space. Otherwise (a pipe, or an object
+        without a file descriptor), fall back to :py:func:`shutil.copyfileobj`.
+
+        :param src: File-like object to read data from
+        :param dst: File-like object to write data to
+        """
+        dst.flush()
+        try:
+            in_fd = src.fileno()
+            out_fd = dst.fileno()
+            # use logical position, *src* may have buffered some data already
+            offset = start = src.tell()
+        except (OSError, ValueError):
+            shutil.copyfileobj(src, dst)
+            return
+        try:
+            while sent := os.sendfile(out_fd, in_fd, offset, 1 << 20):
+                offset += sent
+        except OSError as e:
+            if e.errno not in (errno.EINVAL, errno.ENOSYS) or offset != start:
+                raise
+            shutil.copyfileobj(src, dst)
+            return
+        src.seek(offset)
+
     @staticmethod
     def _call_with_stream(command: str | list[str], payload: bytes | None,
                           payload_stream: IO)\
@@ -745,7 +871,7 @@ class QubesBase(qubesadmin.base.PropertyHolder):
                 assert proc.stdin is not None
                 proc.stdin.write(payload)
                 try:
-                    shutil.copyfileobj(payload_stream, proc.stdin)
+                    QubesBase._copy_stream(payload_stream, proc.stdin)
                 except BrokenPipeError:
                     # We might receive an error from qubesd before we sent
                     # everything (for instance, because we are sending too much
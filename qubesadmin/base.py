@@ -20,23 +20,49 @@
 '''Base classes for managed objects'''
 from __future__ import annotations
 
+import concurrent.futures
+import functools
+import sys
 import typing
 from typing import BinaryIO, Any, TypeAlias, TypeVar, Generic
-from collections.abc import Generator
+from collections.abc import Callable, Generator, Iterable
 
 import qubesadmin.exc
 
 if typing.TYPE_CHECKING:
     from qubesadmin.vm import QubesVM
     from qubesadmin.app import QubesBase
+    from qubesadmin.label import Label
 
 DEFAULT = object()
 
+#: value of a property that is not set (empty bool or int); kept in the
+#: properties cache, so that accessing such property raises AttributeError
+_MISSING = object()
+
+_DISPVM_PREFIX = "@dispvm"
+_DISPVM_PREFIX_LEN = len(_DISPVM_PREFIX)
+
 # We use Any because the dynamic metatada handling of the current code
 # is too complex for type checkers otherwise
 VMProperty: TypeAlias = Any  # noqa: ANN401
 
 
+def unescape(line: bytes) -> bytes:
+    """Handle \\-escaped values as sent in (prefix).GetAll responses.
+
+    Only ``\\n`` (newline) and ``\\\\`` (backslash) escapes are allowed.
+    """
+    if b'\\' not in line:
+        return line
+    # escape sequences are two bytes long and never overlap, so the leftmost
+    # double backslash is always an escaped backslash
+    parts = line.split(b'\\\\')
+    for part in parts:
+        assert part.count(b'\\') == part.count(b'\\n')
+    return b'\\'.join(part.replace(b'\\n', b'\n') for part in parts)
+
+
 class PropertyHolder:
     '''A base class for object having properties retrievable using mgmt API.
 
@@ -47,14 +73,30 @@ class PropertyHolder:
     #: a place for appropriate Qubes() object (QubesLocal or QubesRemote),
     # use None for self
     app: QubesBase
+    #: redirect calls targeting '@dispvm' to the disposable template,
+    # see :py:class:`qubesadmin.vm.DispVMWrapper`
+    _redirect_dispvm_calls: bool = False
+    #: placeholder replaced in __init__, so that the __getattr__ fast path
+    # does not recurse on a not yet initialized object; never modified
+    _properties_cache: dict[str, tuple[bool, VMProperty]] = {}
 
     def __init__(self, app: QubesBase, method_prefix: str, method_dest: str):
         #: appropriate Qubes() object (QubesLocal or QubesRemote), use None
         # for self
         self.app = app
         self._method_prefix = method_prefix
+        # method names used on every property access, built once
+        self._m_get = method_prefix + 'Get'
+        self._m_set = method_prefix + 'Set'
+        self._m_list = method_prefix + 'List'
+        self._m_help = method_prefix + 'Help'
+        self._m_getall = method_prefix + 'GetAll'
+        self._m_getdefault = method_prefix + 'GetDefault'
+        self._m_reset = method_prefix + 'Reset'
+        self._m_setmany = method_prefix + 'SetMany'
         self._method_dest = method_dest
-        self._properties: list[str] | None = None
+        self._properties: tuple[str, ...] | None = None
+        self._properties_set: frozenset[str] | None = None
         self._properties_help = None
         # the cache is maintained by EventsDispatcher(),
         # through helper functions in QubesBase()
@@ -82,15 +124,45 @@ class PropertyHolder:
         :param payload_stream: file-like object to read payload from
         :return: Data returned by qubesd (string)
         '''
-        dest: str = dest or self._method_dest
-        if (
-            getattr(self, "_redirect_dispvm_calls", False)
-            and dest.startswith("@dispvm")
-        ):
-            if dest.startswith("@dispvm:"):
-                dest = dest[len("@dispvm:") :]
+        dest = self._resolve_dest(dest)
+        # have the actual implementation at Qubes() instance
+        return self.app.qubesd_call(dest, method, arg, payload,
+            payload_stream)
+
+    def qubesd_call_async(self, dest: str | None, method: str,
+                          arg: str | None=None, payload: bytes | None=None) \
+            -> concurrent.futures.Future[bytes]:
+        '''
+        Queue a call into qubesd, to be sent together with other queued
+        calls by :py:meth:`qubesadmin.app.QubesBase.flush_pending` (or at
+        the end of :py:meth:`qubesadmin.app.QubesBase.batching` block).
+
+        :param dest: Destination VM name
+        :param method: Full API method name ('admin...')
+        :param arg: Method argument (if any)
+        :param payload: Payload send to the method
+        :return: Future resolved with data returned by qubesd
+        '''
+        future: concurrent.futures.Future[bytes] = concurrent.futures.Future()
+        # pylint: disable=protected-access
+        self.app._pending_calls.append(
+            (str(self._resolve_dest(dest)), method, arg, payload, future))
+        return future
+
+    def _resolve_dest(self, dest: str | None) -> str | QubesVM:
+        '''
+        Get the actual call destination, handling '@dispvm' redirection.
+
+        :param dest: Destination VM name, None for this object
+        '''
+        dest = dest or self._method_dest
+        if self._redirect_dispvm_calls and dest.startswith(_DISPVM_PREFIX):
+            # '@dispvm:<name>' or just '@dispvm'
+            dispvm_template = dest[_DISPVM_PREFIX_LEN:]
+            if dispvm_template.startswith(":"):
+                dest = dispvm_template[1:]
             else:
-                dest: QubesVM | None = getattr(
+                dest = getattr(
                     self.app.domains.get_blind(self.app.local_name),
                     "default_dispvm",
                     None
@@ -100,9 +172,23 @@ class PropertyHolder:
                         "%s has empty 'default_dispvm' property, but it is "
                         "required when target is @dispvm", self.app.local_name
                     )
-        # have the actual implementation at Qubes() instance
-        return self.app.qubesd_call(dest, method, arg, payload,
-            payload_stream)
+        return dest
+
+    def _qubesd_call_or_none(self, method: str, arg: str | None) \
+            -> bytes | None:
+        '''
+        Call into qubesd for this object, return :py:obj:`None` if access
+        was denied or the object does not exist.
+
+        :param method: Full API method name ('admin...')
+        :param arg: Method argument (if any)
+        :return: Data returned by qubesd, or None
+        '''
+        try:
+            return self.qubesd_call(self._method_dest, method, arg, None)
+        except (qubesadmin.exc.QubesDaemonAccessError,
+                qubesadmin.exc.QubesVMNotFoundError):
+            return None
 
     @staticmethod
     def _parse_qubesd_response(response_data: bytes) -> bytes:
@@ -120,12 +206,22 @@ class PropertyHolder:
         if response_data[0:2] == b'\x30\x00':
             return response_data[2:]
         if response_data[0:2] == b'\x32\x00':
-            (_, exc_type, _traceback, format_string, args) = \
-                response_data.split(b'\x00', 4)
-            # drop last field because of terminating '\x00'
-            args = [arg.decode() for arg in args.split(b'\x00')[:-1]]
-            format_string = format_string.decode('utf-8')
-            exc_type = exc_type.decode('ascii')
+            # fields: exc_type, traceback, format_string, args...; each one
+            # terminated by '\x00'; decode them in place, without splitting
+            view = memoryview(response_data)
+            end = response_data.index(b'\x00', 2)
+            exc_type = str(view[2:end], 'ascii')
+            # skip traceback
+            start = response_data.index(b'\x00', end + 1) + 1
+            end = response_data.index(b'\x00', start)
+            format_string = str(view[start:end], 'utf-8')
+            args = []
+            start = end + 1
+            end = response_data.find(b'\x00', start)
+            while end != -1:
+                args.append(str(view[start:end], 'utf-8'))
+                start = end + 1
+                end = response_data.find(b'\x00', start)
             try:
                 exc_class = getattr(qubesadmin.exc, exc_type)
             except AttributeError:
@@ -148,12 +244,20 @@ class PropertyHolder:
         if self._properties is None:
             properties_str = self.qubesd_call(
                 self._method_dest,
-                self._method_prefix + 'List',
+                self._m_list,
                 None,
                 None)
-            self._properties = properties_str.decode('ascii').splitlines()
-        # TODO: make it somehow immutable
-        return self._properties
+            # property names are shared by all objects of the same kind
+            self._set_property_names(
+                sys.intern(name) for name in
+                properties_str.decode('ascii').splitlines())
+        assert self._properties is not None
+        return list(self._properties)
+
+    def _set_property_names(self, names: Iterable[str]) -> None:
+        '''Save list of property names, as returned by qubesd'''
+        self._properties = tuple(names)
+        self._properties_set = frozenset(self._properties)
 
     def property_help(self, name: str) -> str:
         '''
@@ -163,7 +267,7 @@ class PropertyHolder:
         '''
         help_text = self.qubesd_call(
             self._method_dest,
-            self._method_prefix + 'Help',
+            self._m_help,
             name,
             None)
         return help_text.decode('ascii')
@@ -184,16 +288,12 @@ class PropertyHolder:
         if item in self._properties_cache:
             return self._properties_cache[item][0]
         # cached properties list
-        if self._properties is not None and item not in self._properties:
+        if self._properties_set is not None \
+                and item not in self._properties_set:
             raise AttributeError(item)
-        try:
-            property_str = self.qubesd_call(
-                self._method_dest,
-                self._method_prefix + 'Get',
-                item,
-                None)
-        except (qubesadmin.exc.QubesDaemonAccessError,
-                qubesadmin.exc.QubesVMNotFoundError):
+        property_str = self._qubesd_call_or_none(
+            self._m_get, item)
+        if property_str is None:
             raise qubesadmin.exc.QubesPropertyAccessError(item)
         is_default, value = self._deserialize_property(property_str)
         if self.app.cache_enabled:
@@ -209,24 +309,31 @@ class PropertyHolder:
         '''
         if item.startswith('_'):
             raise AttributeError(item)
-        try:
-            property_str = self.qubesd_call(
-                self._method_dest,
-                self._method_prefix + 'GetDefault',
-                item,
-                None)
-        except (qubesadmin.exc.QubesDaemonAccessError,
-                qubesadmin.exc.QubesVMNotFoundError):
+        property_str = self._qubesd_call_or_none(
+            self._m_getdefault, item)
+        if property_str is None:
             raise qubesadmin.exc.QubesPropertyAccessError(item)
         if not property_str:
             raise AttributeError(item + ' has no default')
-        (prop_type, value) = property_str.split(b' ', 1)
-        return self._parse_type_value(prop_type, value)
+        (prop_type, _, value) = property_str.partition(b' ')
+        value = self._parse_type_value(prop_type, value)
+        if value is _MISSING:
+            raise AttributeError(item + ' has no default')
+        return value
 
     def clone_properties(self, src: PropertyHolder,
                          proplist: list[str] | None=None) -> None:
         '''Clone properties from other object.
 
+        Source values are taken from its properties cache if all of them are
+        there, otherwise retrieved with a single (prefix).GetAll call. They
+        are set with a single (prefix).SetMany call, if qubesd allows it
+        (a refusal is remembered, SetMany is not tried again then).
+        Otherwise (including when SetMany fails to set any of them),
+        properties are copied one by one, skipping those which cannot be
+        set. Properties implemented on the Python object (like qube's name)
+        are always set one by one, through their setters.
+
         :param PropertyHolder src: source object
         :param list proplist: list of properties \
             (:py:obj:`None` or omit for all properties)
@@ -235,40 +342,100 @@ class PropertyHolder:
         if proplist is None:
             proplist = self.property_list()
 
+        # pylint: disable=protected-access
+        src_cache = src._properties_cache
+        if src_cache and all(prop in src_cache for prop in proplist):
+            src_properties: dict[str, tuple[bool, VMProperty]] | None = \
+                src_cache
+        else:
+            src_properties = src._get_all_properties()
+        values = {}
         for prop in proplist:
+            if src_properties is None:
+                try:
+                    value = getattr(src, prop)
+                except AttributeError:
+                    continue
+            else:
+                if prop not in src_properties:
+                    continue
+                value = src_properties[prop][1]
+                if value is _MISSING:
+                    continue
+            values[prop] = value
+
+        local_properties = self._local_properties()
+        for prop in [prop for prop in values if prop in local_properties]:
             try:
-                setattr(self, prop, getattr(src, prop))
+                setattr(self, prop, values.pop(prop))
+            except AttributeError:
+                continue
+
+        if not values:
+            return
+
+        lines = []
+        for prop, value in values.items():
+            # escape newlines the same way as (prefix).GetAll does
+            value_bytes = self._serialize_value(value) \
+                .replace(b'\\', b'\\\\').replace(b'\n', b'\\n')
+            lines.append(prop.encode('ascii') + b' ' + value_bytes + b'\n')
+        payload = b''.join(lines)
+        refused_methods = self.app._refused_methods
+        if self._m_setmany not in refused_methods:
+            try:
+                self.qubesd_call(
+                    self._method_dest,
+                    self._m_setmany,
+                    None,
+                    payload)
+                return
+            except qubesadmin.exc.QubesDaemonAccessError:
+                refused_methods.add(self._m_setmany)
+            except qubesadmin.exc.QubesException:
+                pass
+
+        for prop, value in values.items():
+            try:
+                setattr(self, prop, value)
             except AttributeError:
                 continue
 
     def __getattr__(self, item: str) -> VMProperty:
+        # cached value - checked first, as this is the hot path; private
+        # names are never cached
+        cache = self._properties_cache
+        if item in cache:
+            value = cache[item][1]
+            if value is _MISSING:
+                raise AttributeError(item)
+            return value
+        return self._getattr_uncached(item)
+
+    def _getattr_uncached(self, item: str) -> VMProperty:
+        '''Get property value not found in the properties cache'''
         if item.startswith('_'):
             raise AttributeError(item)
         # pre-fill cache if enabled
         if self.app.cache_enabled and not self._properties_cache:
             self._fetch_all_properties()
-        # cached value
-        if item in self._properties_cache:
-            value = self._properties_cache[item][1]
-            if value is AttributeError:
-                raise AttributeError(item)
-            return value
+            if item in self._properties_cache:
+                value = self._properties_cache[item][1]
+                if value is _MISSING:
+                    raise AttributeError(item)
+                return value
         # cached properties list
-        if self._properties is not None and item not in self._properties:
+        if self._properties_set is not None \
+                and item not in self._properties_set:
             raise AttributeError(item)
-        try:
-            property_str = self.qubesd_call(
-                self._method_dest,
-                self._method_prefix + 'Get',
-                item,
-                None)
-        except (qubesadmin.exc.QubesDaemonNoResponseError,
-                qubesadmin.exc.QubesVMNotFoundError):
+        property_str = self._qubesd_call_or_none(
+            self._m_get, item)
+        if property_str is None:
             raise qubesadmin.exc.QubesPropertyAccessError(item)
         is_default, value = self._deserialize_property(property_str)
         if self.app.cache_enabled:
             self._properties_cache[item] = (is_default, value)
-        if value is AttributeError:
+        if value is _MISSING:
             raise AttributeError(item)
         return value
 
@@ -279,10 +446,10 @@ class PropertyHolder:
         :param api_response: bytes, as retrieved from qubesd
         :return: tuple(is_default, value)
         """
-        (default, prop_type, value) = api_response.split(b' ', 2)
+        (default, _, rest) = api_response.partition(b' ')
+        (prop_type, _, value) = rest.partition(b' ')
         assert default.startswith(b'default=')
-        is_default_str = default.split(b'=')[1]
-        is_default = is_default_str.decode('ascii') == "True"
+        is_default = default.removeprefix(b'default=') == b'True'
         value = self._parse_type_value(prop_type, value)
         return is_default, value
 
@@ -291,106 +458,94 @@ class PropertyHolder:
         Parse `type=... ...` qubesd response format. Return a value of
         appropriate type.
 
-        Returns AttributeError instead of ValueError since this is used
-        to access named field <prop_type>
+        Returns _MISSING marker instead of raising ValueError for an empty
+        bool or int, since this is used to access named field <prop_type>
 
         :param bytes prop_type: 'type=...' part of the response (including
             `type=` prefix)
         :param bytes value: 'value' part of the response
         :return: parsed value
         '''
-        # pylint: disable=too-many-return-statements
-        prop_type: str = prop_type.decode('ascii')
-        if not prop_type.startswith('type='):
+        parser = _TYPE_PARSERS.get(prop_type)
+        if parser is None:
+            prop_type_str = prop_type.decode('ascii')
+            if not prop_type_str.startswith('type='):
+                raise qubesadmin.exc.QubesDaemonCommunicationError(
+                    f'Invalid type prefix received: {prop_type_str}')
             raise qubesadmin.exc.QubesDaemonCommunicationError(
-                f'Invalid type prefix received: {prop_type}')
-        (_, prop_type) = prop_type.split('=', 1)
-        value: str = value.decode()
-        if prop_type == 'str':
-            return str(value)
-        if prop_type == 'bool':
-            if value == '':
-                # TODO shouldn't that at least be ValueError ?
-                #  but then we need to properly propagate that modification
-                return AttributeError
-            return value == "True"
-        if prop_type == 'int':
-            if value == '':
-                # TODO same as above
-                return AttributeError
-            return int(value)
-        if prop_type == 'vm':
-            if value == '':
-                return None
-            return self.app.domains.get_blind(value)
-        if prop_type == 'label':
-            if value == '':
-                return None
-            return self.app.labels.get_blind(value)
-        raise qubesadmin.exc.QubesDaemonCommunicationError(
-            f'Received invalid value type: {prop_type}')
+                'Received invalid value type: '
+                f'{prop_type_str.partition("=")[2]}')
+        return parser(self, value.decode())
 
-    def _fetch_all_properties(self) -> None:
+    def _get_all_properties(self) \
+            -> dict[str, tuple[bool, VMProperty]] | None:
         """
         Retrieve all properties values at once using (prefix).property.GetAll
-        method. If it succeed, save retrieved values in the properties cache.
-        If the request fails (for example because of qrexec policy), do nothing.
-        Exceptions when parsing received value are not handled.
+        method, without touching the properties cache.
+        If the request fails (for example because of qrexec policy), return
+        None. Exceptions when parsing received value are not handled.
 
-        :return: None
+        :return: dict of name -> (is_default, value), or None
         """
 
-        def unescape(line: bytes) -> Generator[int]:
-            """Handle \\-escaped values, generates a list of character codes"""
-            escaped = False
-            for char in line:
-                if escaped:
-                    assert char in (ord('n'), ord('\\'))
-                    if char == ord('n'):
-                        yield ord('\n')
-                    elif char == ord('\\'):
-                        yield char
-                    escaped = False
-                elif char == ord('\\'):
-                    escaped = True
-                else:
-                    yield char
-            assert not escaped
-
         try:
             properties_str = self.qubesd_call(
                 self._method_dest,
-                self._method_prefix + 'GetAll',
+                self._m_getall,
                 None,
                 None)
         except qubesadmin.exc.QubesDaemonNoResponseError:
-            return
+            return None
+        properties = {}
         for line in properties_str.splitlines():
             # decode newlines
-            line_bytes = bytes(list(unescape(line)))
-            name, property_str = line_bytes.split(b' ', 1)
-            name = name.decode()
-            is_default, value = self._deserialize_property(property_str)
-            self._properties_cache[name] = (is_default, value)
-        self._properties = list(self._properties_cache.keys())
+            line_bytes = unescape(line)
+            name, _, property_str = line_bytes.partition(b' ')
+            name = sys.intern(name.decode('ascii'))
+            properties[name] = self._deserialize_property(property_str)
+        return properties
+
+    def _fetch_all_properties(self) -> None:
+        """
+        Retrieve all properties values at once using (prefix).property.GetAll
+        method. If it succeed, save retrieved values in the properties cache.
+        If the request fails (for example because of qrexec policy), do nothing.
+        Exceptions when parsing received value are not handled.
+
+        :return: None
+        """
+        properties = self._get_all_properties()
+        if properties is None:
+            return
+        # called only with an empty cache; take the freshly built dict as is,
+        # instead of growing the old one entry by entry
+        self._properties_cache = properties
+        self._set_property_names(properties)
 
     @classmethod
-    def _local_properties(cls) -> set:
+    @functools.cache
+    def _local_properties(cls) -> frozenset[str]:
         '''
         Get set of property names that are properties on the Python object,
         and must not be set on the remote object
         '''
-        if "_local_properties_set" not in cls.__dict__:
-            props = set()
-            for class_ in cls.__mro__:
-                for key in class_.__dict__:
-                    props.add(key)
-                if hasattr(class_, "__annotations__"):
-                    for key in class_.__annotations__:
-                        props.add(key)
-            cls._local_properties_set = props
-
-        return cls._local_properties_set
+        props = set()
+        for class_ in cls.__mro__:
+            props.update(class_.__dict__)
+            if hasattr(class_, "__annotations__"):
+                props.update(class_.__annotations__)
+        return frozenset(props)
+
+    @staticmethod
+    def _serialize_value(value: VMProperty) -> bytes:
+        '''Serialize property value for (prefix).Set call'''
+        # Dynamic import because qubesadmin.vm imports base.py
+        from qubesadmin.vm import QubesVM
+        if isinstance(value, QubesVM):
+            value = value.name
+        if value is None:
+            value = ''
+        return str(value).encode('utf-8')
 
     def __setattr__(self, key: str, value: typing.Any) -> None:  # noqa: ANN401
         if key.startswith('_') or key in self._local_properties():
@@ -399,25 +554,19 @@ class PropertyHolder:
             try:
                 self.qubesd_call(
                     self._method_dest,
-                    self._method_prefix + 'Reset',
+                    self._m_reset,
                     key,
                     None)
             except (qubesadmin.exc.QubesDaemonNoResponseError,
                     qubesadmin.exc.QubesVMNotFoundError):
                 raise qubesadmin.exc.QubesPropertyAccessError(key)
         else:
-            # Dynamic import because qubesadmin.vm imports base.py
-            from qubesadmin.vm import QubesVM
-            if isinstance(value, QubesVM):
-                value = value.name
-            if value is None:
-                value = ''
             try:
                 self.qubesd_call(
                     self._method_dest,
-                    self._method_prefix + 'Set',
+                    self._m_set,
                     key,
-                    str(value).encode('utf-8'))
+                    self._serialize_value(value))
             except (qubesadmin.exc.QubesDaemonNoResponseError,
                     qubesadmin.exc.QubesVMNotFoundError):
                 raise qubesadmin.exc.QubesPropertyAccessError(key)
@@ -428,20 +577,73 @@ class PropertyHolder:
         try:
             self.qubesd_call(
                 self._method_dest,
-                self._method_prefix + 'Reset',
+                self._m_reset,
                 name
             )
         except (qubesadmin.exc.QubesDaemonNoResponseError,
                 qubesadmin.exc.QubesVMNotFoundError):
             raise qubesadmin.exc.QubesPropertyAccessError(name)
 
+
+def _parse_str(_holder: PropertyHolder, value: str) -> str:
+    '''Parse str property value'''
+    return value
+
+
+def _parse_bool(_holder: PropertyHolder, value: str) \
+        -> bool | object:
+    '''Parse bool property value'''
+    if value == '':
+        # TODO shouldn't that at least be ValueError ?
+        #  but then we need to properly propagate that modification
+        return _MISSING
+    return value == "True"
+
+
+def _parse_int(_holder: PropertyHolder, value: str) \
+        -> int | object:
+    '''Parse int property value'''
+    if value == '':
+        # TODO same as above
+        return _MISSING
+    return int(value)
+
+
+def _parse_vm(holder: PropertyHolder, value: str) -> QubesVM | None:
+    '''Parse vm property value'''
+    if value == '':
+        return None
+    return holder.app.domains.get_blind(value)
+
+
+def _parse_label(holder: PropertyHolder, value: str) -> Label | None:
+    '''Parse label property value'''
+    if value == '':
+        return None
+    return holder.app.labels.get_blind(value)
+
+
+#: parsers for `type=...` part of qubesd response, see
+#: :py:meth:`PropertyHolder._parse_type_value`
+_TYPE_PARSERS: dict[bytes, Callable[[PropertyHolder, str], VMProperty]] = {
+    b'type=str': _parse_str,
+    b'type=bool': _parse_bool,
+    b'type=int': _parse_int,
+    b'type=vm': _parse_vm,
+    b'type=label': _parse_label,
+}
+
 WrapperObjectsCollectionKey: TypeAlias = int | str
 T = TypeVar('T')
 
 class WrapperObjectsCollection(Generic[T]):
     '''Collection of simple named objects'''
     def __init__(self, app: QubesBase,
-                 list_method: str, object_class: type[T]):
+                 list_method: str, object_class: type[T],
+                 full_list_method: str | None=None,
+                 parse_line: Callable[
+                     [str], tuple[WrapperObjectsCollectionKey, dict[str, Any]]]
+                 | None=None):
         '''
         Construct manager of named wrapper objects.
 
@@ -450,10 +652,19 @@ class WrapperObjectsCollection(Generic[T]):
             must return simple "one name per line" list
         :param object_class: object class (callable) for wrapper objects,
             will be called with just two arguments: app and a name
+        :param full_list_method: name of API method listing objects together
+            with their attributes, one object per line; used when iterating
+            over all the objects, if qubesd supports it
+        :param parse_line: function parsing a line of *full_list_method*
+            output into object name and a dict of attributes to set on it
         '''
         self.app = app
         self._list_method = list_method
         self._object_class = object_class
+        self._full_list_method = full_list_method
+        self._parse_line = parse_line
+        #: objects attributes were filled using full_list_method
+        self._prefilled = False
         #: names cache
         self._names_list: list[WrapperObjectsCollectionKey] | None = None
         #: returned objects cache
@@ -467,6 +678,7 @@ class WrapperObjectsCollection(Generic[T]):
         explicitly too.
         """
         self._names_list = None
+        self._prefilled = False
         if invalidate_name:
             self._objects.pop(invalidate_name, None)
 
@@ -474,19 +686,53 @@ class WrapperObjectsCollection(Generic[T]):
         '''Refresh cached list of names'''
         if not force and self._names_list is not None:
             return
-        list_data = self.app.qubesd_call('dom0', self._list_method)
-        list_data = list_data.decode('ascii')
-        assert list_data[-1] == '\n'
-        self._names_list = [str(name) for name in list_data[:-1].splitlines()]
-
-        for name, obj in self._objects.items():
-            assert hasattr(obj, "name")
-            if obj.name not in self._names_list:
-                # Object no longer exists
-                del self._objects[name]
+        lines = self.app.qubesd_call('dom0', self._list_method).split(b'\n')
+        if lines and lines[-1] == b'':
+            lines.pop()
+        self._prefilled = False
+        self._set_names([sys.intern(name.decode('ascii')) for name in lines])
+
+    def _set_names(self, names: list[WrapperObjectsCollectionKey]) -> None:
+        '''Store list of names and drop objects no longer present'''
+        self._names_list = names
+
+        # objects no longer existing
+        for name in self._objects.keys() - set(names):
+            del self._objects[name]
+
+    def _prefill_objects(self) -> None:
+        '''Load names and objects attributes at once, using
+        *full_list_method* (if any)'''
+        if self._prefilled or self._full_list_method is None:
+            return
+        assert self._parse_line is not None
+        try:
+            list_data = self.app.qubesd_call('dom0', self._full_list_method)
+        except qubesadmin.exc.QubesDaemonAccessError:
+            # not supported by qubesd, attributes will be fetched on demand
+            self._full_list_method = None
+            return
+        names = []
+        for line in list_data.decode('ascii').splitlines():
+            name, attrs = self._parse_line(line)
+            obj = self.get_blind(name)
+            for attr, value in attrs.items():
+                setattr(obj, attr, value)
+            names.append(name)
+        self._set_names(names)
+        self._prefilled = True
+
+    def _ensure_names(self) -> list[WrapperObjectsCollectionKey]:
+        '''Get cached list of names, refreshing it if needed'''
+        names = self._names_list
+        if names is None:
+            self.refresh_cache(force=True)
+            names = self._names_list
+            assert names is not None
+        return names
 
     def __getitem__(self, item: WrapperObjectsCollectionKey) -> T:
-        if not self.app.blind_mode and item not in self:
+        if not self.app.blind_mode and item not in self._ensure_names():
             raise KeyError(item)
         return self.get_blind(item)
 
@@ -500,29 +746,23 @@ class WrapperObjectsCollection(Generic[T]):
         return self._objects[item]
 
     def __contains__(self, item: WrapperObjectsCollectionKey) -> bool:
-        self.refresh_cache()
-        assert self._names_list is not None
-        return item in self._names_list
+        return item in self._ensure_names()
 
     def __iter__(self) -> Generator[WrapperObjectsCollectionKey]:
-        self.refresh_cache()
-        assert self._names_list is not None
-        yield from self._names_list
+        yield from self._ensure_names()
 
     def keys(self) -> list[WrapperObjectsCollectionKey]:
         '''Get list of names.'''
-        self.refresh_cache()
-        assert self._names_list is not None
-        return list(self._names_list)
-
-    def items(self) -> list[tuple[WrapperObjectsCollectionKey, T]]:
-        '''Get list of (key, value) pairs'''
-        self.refresh_cache()
-        assert self._names_list is not None
-        return [(key, self.get_blind(key)) for key in self._names_list]
-
-    def values(self) -> list[T]:
-        '''Get list of objects'''
-        self.refresh_cache()
-        assert self._names_list is not None
-        return [self.get_blind(key) for key in self._names_list]
+        return list(self._ensure_names())
+
+    def items(self) -> Generator[tuple[WrapperObjectsCollectionKey, T]]:
+        '''Get iterable of (key, value) pairs'''
+        self._prefill_objects()
+        for key in self._ensure_names():
+            yield key, self.get_blind(key)
+
+    def values(self) -> Generator[T]:
+        '''Get iterable of objects'''
+        self._prefill_objects()
+        for key in self._ensure_names():
+            yield self.get_blind(key)
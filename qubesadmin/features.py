@@ -24,6 +24,9 @@ import typing
 from typing import TypeVar
 from collections.abc import Iterator, Generator
 
+import qubesadmin.base
+import qubesadmin.exc
+
 if typing.TYPE_CHECKING:
     from qubesadmin.vm import QubesVM
 
@@ -44,6 +47,8 @@ class Features:
     def __init__(self, vm: QubesVM):
         super().__init__()
         self.vm = vm
+        #: qubesd refused admin.vm.feature.GetAll, do not try it again
+        self._getall_refused = False
 
     def __delitem__(self, key: str) -> None:
         self.vm.qubesd_call(self.vm.name, 'admin.vm.feature.Remove', key)
@@ -61,6 +66,30 @@ class Features:
         return self.vm.qubesd_call(
             self.vm.name, 'admin.vm.feature.Get', item).decode('utf-8')
 
+    @typing.overload
+    def get_raw(self, item: str) -> bytes | None: ...
+    @typing.overload
+    def get_raw(self, item: str, default: T) -> bytes | T: ...
+    # Overloaded to handle default None return type
+    def get_raw(self, item: str, default: object = None) -> object:
+        '''Get a feature as undecoded bytes, return default value if missing.
+
+        Useful when only checking if a feature is set (and true), to avoid
+        decoding its value.
+        '''
+        return self._call_with_default('admin.vm.feature.Get', item, default)
+
+    def _call_with_default(self, method: str, feature: str,
+                           default: object) -> object:
+        '''Call *method* about *feature*, return default value if the
+        feature is missing (or raise KeyError, if there is no default).'''
+        try:
+            return self.vm.qubesd_call(self.vm.name, method, feature)
+        except KeyError:
+            if default is self.NO_DEFAULT:
+                raise
+            return default
+
     def __iter__(self) -> Iterator[str]:
         qubesd_response = self.vm.qubesd_call(self.vm.name,
             'admin.vm.feature.List')
@@ -68,10 +97,37 @@ class Features:
 
     keys = __iter__
 
-    def items(self) -> Generator[tuple[str, str]]:
-        '''Return iterable of pairs (feature, value)'''
+    def items(self, prefix: str = '') -> Generator[tuple[str, str]]:
+        '''Return iterable of pairs (feature, value)
+
+        All the values are retrieved at once using admin.vm.feature.GetAll
+        method. If that fails (for example because of qrexec policy), fall
+        back to retrieving features one by one.
+
+        :param str prefix: include only features with names starting with \
+            *prefix* (other values are not retrieved in the fallback case)
+        '''
+        if not self._getall_refused:
+            try:
+                qubesd_response = self.vm.qubesd_call(self.vm.name,
+                    'admin.vm.feature.GetAll')
+            except qubesadmin.exc.QubesDaemonAccessError:
+                self._getall_refused = True
+            else:
+                for line in qubesd_response.splitlines():
+                    # decode newlines
+                    key, _, value = \
+                        qubesadmin.base.unescape(line).partition(b' ')
+                    name = key.decode('utf-8')
+                    if name.startswith(prefix):
+                        yield name, value.decode('utf-8')
+                return
+        qubesd_call = self.vm.qubesd_call
+        vm_name = self.vm.name
         for key in self:
-            yield key, self[key]
+            if key.startswith(prefix):
+                yield key, qubesd_call(
+                    vm_name, 'admin.vm.feature.Get', key).decode('utf-8')
 
     NO_DEFAULT = object()
 
@@ -82,26 +138,35 @@ class Features:
     # Overloaded to handle default None return type
     def get(self, item: str, default: object = None) -> object:
         '''Get a feature, return default value if missing.'''
-        try:
-            return self[item]
-        except KeyError:
-            if default is self.NO_DEFAULT:
-                raise
+        value = self.get_raw(item, default)
+        if value is default:
             return default
+        assert isinstance(value, bytes)
+        return value.decode('utf-8')
 
     @typing.overload
-    def check_with_template(self, item: str) -> str | None: ...
+    def check_with_template(self, feature: str) -> str | None: ...
     @typing.overload
-    def check_with_template(self, item: str, default: T) -> str | T: ...
+    def check_with_template(self, feature: str, default: T) -> str | T: ...
     # Overloaded to handle default None return type
     def check_with_template(self, feature: str,
                             default: object = None) -> object:
         ''' Check if the vm's template has the specified feature. '''
-        try:
-            qubesd_response = self.vm.qubesd_call(
-                self.vm.name, 'admin.vm.feature.CheckWithTemplate', feature)
-            return qubesd_response.decode('utf-8')
-        except KeyError:
-            if default is self.NO_DEFAULT:
-                raise
+        value = self.check_with_template_raw(feature, default)
+        if value is default:
             return default
+        assert isinstance(value, bytes)
+        return value.decode('utf-8')
+
+    @typing.overload
+    def check_with_template_raw(self, feature: str) -> bytes | None: ...
+    @typing.overload
+    def check_with_template_raw(self, feature: str,
+                                default: T) -> bytes | T: ...
+    # Overloaded to handle default None return type
+    def check_with_template_raw(self, feature: str,
+                                default: object = None) -> object:
+        ''' Check if the vm's template has the specified feature, return its
+        value as undecoded bytes. '''
+        return self._call_with_default(
+            'admin.vm.feature.CheckWithTemplate', feature, default)
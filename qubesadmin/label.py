@@ -19,7 +19,7 @@
 
 '''VM Labels'''
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import qubesadmin.exc
 
@@ -36,9 +36,12 @@ class Label:
     :param str name: label's name like "red" or "green"
     '''
 
+    __slots__ = ('app', 'name', '_color', '_index')
+
     def __init__(self, app: QubesBase, name: str):
         self.app = app
-        self._name = name
+        #: label's name like "red" or "green"
+        self.name = name
         self._color: str | None = None
         self._index: int | None = None
 
@@ -48,17 +51,12 @@ class Label:
         if self._color is None:
             try:
                 qubesd_response = self.app.qubesd_call(
-                    'dom0', 'admin.label.Get', self._name, None)
+                    'dom0', 'admin.label.Get', self.name, None)
             except qubesadmin.exc.QubesDaemonNoResponseError:
                 raise qubesadmin.exc.QubesPropertyAccessError('label.color')
             self._color = qubesd_response.decode()
         return self._color
 
-    @property
-    def name(self) -> str:
-        '''label's name like "red" or "green"'''
-        return self._name
-
     @property
     def icon(self) -> str:
         '''freedesktop icon name, suitable for use in
@@ -71,14 +69,14 @@ class Label:
         if self._index is None:
             try:
                 qubesd_response = self.app.qubesd_call(
-                    'dom0', 'admin.label.Index', self._name, None)
+                    'dom0', 'admin.label.Index', self.name, None)
             except qubesadmin.exc.QubesDaemonNoResponseError:
                 raise qubesadmin.exc.QubesPropertyAccessError('label.index')
             self._index = int(qubesd_response.decode())
         return self._index
 
     def __str__(self) -> str:
-        return self._name
+        return self.name
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, Label):
@@ -87,3 +85,10 @@ class Label:
 
     def __hash__(self) -> int:
         return hash(self.name)
+
+
+def parse_list_full_line(line: str) -> tuple[str, dict[str, Any]]:
+    '''Parse a line of `admin.label.ListFull` output (``name color index``)
+    into label name and its cached attributes'''
+    name, color, index = line.split(' ')
+    return name, {'_color': color, '_index': int(index)}
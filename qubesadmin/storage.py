@@ -19,16 +19,102 @@
 
 """Storage subsystem."""
 from __future__ import annotations
+import concurrent.futures
+import functools
+import sys
 from typing import BinaryIO, TYPE_CHECKING, IO
-from collections.abc import Generator
+from collections.abc import Callable, Generator, Iterable
 
 import qubesadmin.exc
 if TYPE_CHECKING:
     from qubesadmin.app import QubesBase
 
 
+def _parse_info(info: bytes, encoding: str = 'ascii') -> dict[str, str]:
+    """Parse ``key=value`` lines returned by qubesd into a dict
+
+    Lines are split before decoding, so no decoded copy of the whole
+    response is made. Keys and short values (like 'True' or a pool name)
+    repeat across many volumes and pools, keep a single copy of each.
+    """
+    intern = sys.intern
+    result: dict[str, str] = {}
+    for line in info.splitlines():
+        key, _, value = line.partition(b'=')
+        text = value.decode(encoding)
+        result[intern(key.decode(encoding))] = \
+            intern(text) if len(value) < 64 else text
+    return result
+
+
+_BOOL = {True: b'True', False: b'False'}
+
+
+def _encode_value(value: object) -> bytes:
+    """Format a property value (or size) for qubesd call payload"""
+    if isinstance(value, bool):
+        return _BOOL[value]
+    if isinstance(value, int):
+        return b'%d' % value
+    return str(value).encode('ascii')
+
+
+def _parse_bool(value: str) -> bool:
+    """Parse bool value as formatted by qubesd"""
+    return value == 'True'
+
+
+class VolumeInfo:
+    """Volume properties from an Info reply, converted to their types.
+
+    This is a snapshot - values are not updated after retrieval, see
+    :py:meth:`Volume.info`. Properties not included in the reply are not set
+    (reading them raises AttributeError), except optional `ephemeral` and
+    `is_outdated`.
+    """
+    __slots__ = ('pool', 'vid', 'size', 'usage', 'rw', 'ephemeral',
+                 'snap_on_start', 'save_on_stop', 'source',
+                 'revisions_to_keep', 'is_outdated')
+
+    pool: str
+    vid: str
+    size: int
+    usage: int
+    rw: bool
+    ephemeral: bool
+    snap_on_start: bool
+    save_on_stop: bool
+    source: str | None
+    revisions_to_keep: int
+    is_outdated: bool
+
+    _TYPES: dict[str, Callable[[str], object]] = {
+        'pool': str,
+        'vid': str,
+        'size': int,
+        'usage': int,
+        'rw': _parse_bool,
+        'ephemeral': _parse_bool,
+        'snap_on_start': _parse_bool,
+        'save_on_stop': _parse_bool,
+        'source': lambda value: value or None,
+        'revisions_to_keep': int,
+        'is_outdated': _parse_bool,
+    }
+
+    def __init__(self, info: dict[str, str]):
+        self.ephemeral = False
+        self.is_outdated = False
+        types = self._TYPES
+        for key, value in info.items():
+            convert = types.get(key)
+            if convert is not None:
+                setattr(self, key, convert(value))
+
+
 class Volume:
     """Storage volume."""
+
     def __init__(self, app: QubesBase, pool: str | None=None,
                  vid: str | None=None, vm: str | None=None,
                  vm_name: str | None=None):
@@ -54,7 +140,24 @@ class Volume:
         self._vid = vid
         self._vm = vm
         self._vm_name = vm_name
-        self._info = None
+
+    def _call_target(self, func_name: str, payload: bytes | None = None) \
+            -> tuple[str, str, str | None, bytes | None]:
+        """Get destination, method name, argument and payload of a call to
+        qubesd regarding this volume
+
+        :param str func_name: API function name, like `Info` or `Resize`
+        :param bytes payload: Payload to send.
+        """
+        if self._vm is not None:
+            return self._vm, 'admin.vm.volume.' + func_name, \
+                self._vm_name, payload
+        assert self._vid is not None
+        if payload is not None:
+            payload = self._vid.encode('ascii') + b' ' + payload
+        else:
+            payload = self._vid.encode('ascii')
+        return 'dom0', 'admin.pool.volume.' + func_name, self._pool, payload
 
     def _qubesd_call(self, func_name: str, payload: bytes | None = None,
                      payload_stream: IO | None = None) -> bytes:
@@ -65,27 +168,88 @@ class Volume:
         :param file payload_stream: Stream to pipe payload from. Only one of
         `payload` and `payload_stream` can be used.
         """
-        if self._vm is not None:
-            method = 'admin.vm.volume.' + func_name
-            dest = self._vm
-            arg = self._vm_name
-        else:
-            if payload_stream:
-                raise NotImplementedError(
-                    'payload_stream not implemented for '
-                    'admin.pool.volume.* calls')
-            method = 'admin.pool.volume.' + func_name
-            dest = 'dom0'
-            arg = self._pool
-            assert self._vid is not None
-            if payload is not None:
-                payload = self._vid.encode('ascii') + b' ' + payload
-            else:
-                payload = self._vid.encode('ascii')
+        if self._vm is None and payload_stream:
+            raise NotImplementedError(
+                'payload_stream not implemented for '
+                'admin.pool.volume.* calls')
+        dest, method, arg, payload = self._call_target(func_name, payload)
         return self.app.qubesd_call(
             dest, method, arg, payload=payload,
             payload_stream=payload_stream)
 
+    def info_async(self) -> concurrent.futures.Future[VolumeInfo]:
+        """Queue retrieval of volume properties (see :py:meth:`info`), to be
+        sent together with other calls queued in
+        :py:meth:`qubesadmin.app.QubesBase.batching` block.
+
+        >>> with app.batching():
+        ...     infos = {volume: volume.info_async()
+        ...              for volume in vm.volumes.values()}
+        >>> sizes = {volume: info.result().size
+        ...          for volume, info in infos.items()}
+        """
+        result: concurrent.futures.Future[VolumeInfo] = \
+            concurrent.futures.Future()
+        future = self.app.qubesd_call_async(*self._call_target('Info'))
+        future.add_done_callback(
+            functools.partial(self._info_async_done, result))
+        return result
+
+    def _info_async_done(self, result: concurrent.futures.Future[VolumeInfo],
+                         future: concurrent.futures.Future[bytes]) -> None:
+        """Resolve *result* of :py:meth:`info_async` from the queued call"""
+        if future.cancelled():
+            result.cancel()
+            return
+        exc = future.exception()
+        if isinstance(exc, qubesadmin.exc.QubesDaemonAccessError):
+            result.set_exception(
+                qubesadmin.exc.QubesPropertyAccessError('info'))
+        elif exc is not None:
+            result.set_exception(exc)
+        else:
+            self._info = _parse_info(future.result())
+            result.set_result(self._info_obj)
+
+    @functools.cached_property
+    def _info_map(self) -> dict[str, str]:
+        """Volume properties, retrieved on first use; those which cannot
+        change are then kept until the volume is modified"""
+        try:
+            info = self._qubesd_call('Info')
+        except qubesadmin.exc.QubesDaemonAccessError:
+            raise qubesadmin.exc.QubesPropertyAccessError('info')
+        return _parse_info(info)
+
+    @functools.cached_property
+    def _info_obj(self) -> VolumeInfo:
+        """Volume properties converted to their types"""
+        return VolumeInfo(self._info_map)
+
+    @property
+    def _info(self) -> dict[str, str] | None:
+        """Cached volume properties, None if not retrieved yet"""
+        return self.__dict__.get('_info_map')
+
+    @_info.setter
+    def _info(self, value: dict[str, str] | None) -> None:
+        self.__dict__.pop('_info_obj', None)
+        if value is None:
+            self.__dict__.pop('_info_map', None)
+        else:
+            self.__dict__['_info_map'] = value
+
+    def info(self) -> VolumeInfo:
+        """Retrieve current volume properties, all in one call.
+
+        Properties which may change at any time (like size or usage, also
+        changed by other clients) are retrieved again on each access of
+        the corresponding attribute of the volume; use the returned
+        snapshot to read several of them at once.
+        """
+        self._info = None
+        return self._info_obj
+
     def _fetch_info(self, force: bool = True) -> None:
         """Fetch volume properties
 
@@ -93,11 +257,9 @@ class Volume:
 
         :param bool force: refresh self._info, even if already populated.
         """
-        if not force and self._info is not None:
-            return
-        info = self._qubesd_call('Info')
-        info = info.decode('ascii')
-        self._info = dict([line.split('=', 1) for line in info.splitlines()])
+        if force:
+            self._info = None
+        _ = self._info_map
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, Volume):
@@ -119,6 +281,13 @@ class Volume:
                 return (self._pool, self._vid) < (other._pool, other._vid)
         return NotImplemented
 
+    @functools.cached_property
+    def sort_key(self) -> tuple[str, str, str, str]:
+        """Key ordering volumes the same way as comparing them does, for use
+        with :py:func:`sorted` (cheaper than calling :py:meth:`__lt__`)"""
+        return (self._vm or '', self._vm_name or '',
+                self._pool or '', self._vid or '')
+
     @property
     def name(self) -> str | None:
         """per-VM volume name, if available"""
@@ -129,96 +298,56 @@ class Volume:
         """Storage volume pool name."""
         if self._pool is not None:
             return self._pool
-        try:
-            self._fetch_info()
-        except qubesadmin.exc.QubesDaemonAccessError:
-            raise qubesadmin.exc.QubesPropertyAccessError('pool')
-        assert self._info is not None
-        return str(self._info['pool'])
+        return self._info_obj.pool
 
     @property
     def vid(self) -> str:
         """Storage volume id, unique within given pool."""
         if self._vid is not None:
             return self._vid
-        try:
-            self._fetch_info()
-        except qubesadmin.exc.QubesDaemonAccessError:
-            raise qubesadmin.exc.QubesPropertyAccessError('vid')
-        assert self._info is not None
-        return str(self._info['vid'])
+        return self._info_obj.vid
 
     @property
     def size(self) -> int:
         """Size of volume, in bytes."""
-        try:
-            self._fetch_info()
-        except qubesadmin.exc.QubesDaemonAccessError:
-            raise qubesadmin.exc.QubesPropertyAccessError('size')
-        assert self._info is not None
-        return int(self._info['size'])
+        return self.info().size
 
     @property
     def usage(self) -> int:
         """Used volume space, in bytes."""
-        try:
-            self._fetch_info()
-        except qubesadmin.exc.QubesDaemonAccessError:
-            raise qubesadmin.exc.QubesPropertyAccessError('usage')
-        assert self._info is not None
-        return int(self._info['usage'])
+        return self.info().usage
 
     @property
     def rw(self) -> bool:
         """True if volume is read-write."""
-        try:
-            self._fetch_info()
-        except qubesadmin.exc.QubesDaemonAccessError:
-            raise qubesadmin.exc.QubesPropertyAccessError('rw')
-        assert self._info is not None
-        return self._info['rw'] == 'True'
+        return self.info().rw
 
     @rw.setter
     def rw(self, value: object) -> None:
         """Set rw property"""
-        self._qubesd_call('Set.rw', str(value).encode('ascii'))
+        self._qubesd_call('Set.rw', _encode_value(value))
         self._info = None
 
     @property
     def ephemeral(self) -> bool:
         """True if volume is read-write."""
-        try:
-            self._fetch_info()
-        except qubesadmin.exc.QubesDaemonAccessError:
-            raise qubesadmin.exc.QubesPropertyAccessError('ephemeral')
-        assert self._info is not None
-        return self._info.get('ephemeral', 'False') == 'True'
+        return self.info().ephemeral
 
     @ephemeral.setter
     def ephemeral(self, value: object) -> None:
         """Set rw property"""
-        self._qubesd_call('Set.ephemeral', str(value).encode('ascii'))
+        self._qubesd_call('Set.ephemeral', _encode_value(value))
         self._info = None
 
     @property
     def snap_on_start(self) -> bool:
         """Create a snapshot from source on VM start."""
-        try:
-            self._fetch_info()
-        except qubesadmin.exc.QubesDaemonAccessError:
-            raise qubesadmin.exc.QubesPropertyAccessError('snap_on_start')
-        assert self._info is not None
-        return self._info['snap_on_start'] == 'True'
+        return self._info_obj.snap_on_start
 
     @property
     def save_on_stop(self) -> bool:
         """Commit changes to original volume on VM stop."""
-        try:
-            self._fetch_info()
-        except qubesadmin.exc.QubesDaemonAccessError:
-            raise qubesadmin.exc.QubesPropertyAccessError('save_on_stop')
-        assert self._info is not None
-        return self._info['save_on_stop'] == 'True'
+        return self._info_obj.save_on_stop
 
     @property
     def source(self) -> str | None:
@@ -226,41 +355,24 @@ class Volume:
 
         If None, this volume itself will be used.
         """
-        try:
-            self._fetch_info()
-        except qubesadmin.exc.QubesDaemonAccessError:
-            raise qubesadmin.exc.QubesPropertyAccessError('source')
-        assert self._info is not None
-        if self._info['source']:
-            return self._info['source']
-        return None
+        return self.info().source
 
     @property
     def revisions_to_keep(self) -> int:
         """Number of revisions to keep around"""
-        try:
-            self._fetch_info()
-        except qubesadmin.exc.QubesDaemonAccessError:
-            raise qubesadmin.exc.QubesPropertyAccessError('revisions_to_keep')
-        assert self._info is not None
-        return int(self._info['revisions_to_keep'])
+        return self.info().revisions_to_keep
 
     @revisions_to_keep.setter
     def revisions_to_keep(self, value: object) -> None:
         """Set revisions_to_keep property"""
-        self._qubesd_call('Set.revisions_to_keep', str(value).encode('ascii'))
+        self._qubesd_call('Set.revisions_to_keep', _encode_value(value))
         self._info = None
 
     def is_outdated(self) -> bool:
         """Returns `True` if this snapshot of a source volume (for
         `snap_on_start`=True) is outdated.
         """
-        try:
-            self._fetch_info()
-        except qubesadmin.exc.QubesDaemonAccessError:
-            raise qubesadmin.exc.QubesPropertyAccessError('is_outdated')
-        assert self._info is not None
-        return self._info.get('is_outdated', False) == 'True'
+        return self.info().is_outdated
 
     def resize(self, size: object) -> None:
         """Resize volume.
@@ -269,13 +381,20 @@ class Volume:
 
         :param int size: new size in bytes.
         """
-        self._qubesd_call('Resize', str(size).encode('ascii'))
+        self._qubesd_call('Resize', _encode_value(size))
+        self._info = None
 
     @property
     def revisions(self) -> list[str]:
         """ Returns iterable containing revision identifiers"""
+        return list(self.iter_revisions())
+
+    def iter_revisions(self) -> Generator[str]:
+        """ Yield revision identifiers, decoding them one by one - cheaper
+        than :py:attr:`revisions` when only the first few are needed """
         revisions = self._qubesd_call('ListSnapshots')
-        return revisions.decode('ascii').splitlines()
+        for revision in revisions.splitlines():
+            yield revision.decode('ascii')
 
     def revert(self, revision: str) -> None:
         """ Revert volume to previous revision
@@ -283,6 +402,7 @@ class Volume:
         :param str revision: Revision identifier to revert to
         """
         self._qubesd_call('Revert', revision.encode('ascii'))
+        self._info = None
 
     def import_data(self, stream: BinaryIO) -> None:
         """ Import volume data from a given file-like object.
@@ -292,6 +412,7 @@ class Volume:
         :param stream: file-like object, must support fileno()
         """
         self._qubesd_call('Import', payload_stream=stream)
+        self._info = None
 
     def import_data_with_size(self, stream: IO, size: object) -> None:
         """ Import volume data from a given file-like object, informing qubesd
@@ -302,14 +423,15 @@ class Volume:
         :param stream: file-like object, must support fileno()
         :param size: size of data in bytes
         """
-        size_line = str(size) + '\n'
         self._qubesd_call(
-            'ImportWithSize', payload=size_line.encode(),
+            'ImportWithSize', payload=_encode_value(size) + b'\n',
             payload_stream=stream)
+        self._info = None
 
     def clear_data(self) -> None:
         """ Clear existing volume content. """
         self._qubesd_call('Clear')
+        self._info = None
 
     def clone(self, source: Volume) -> None:
         """ Clone data from sane volume of another VM.
@@ -327,6 +449,7 @@ class Volume:
         token = source._qubesd_call('CloneFrom')
         # and use it to actually clone volume data
         self._qubesd_call('CloneTo', payload=token)
+        self._info = None
 
 
 class Pool:
@@ -341,7 +464,9 @@ class Pool:
         """
         self.app = app
         self.name = name
-        self._config = None
+        self._config: dict[str, str] | None = None
+        #: usage details retrieved by :py:meth:`prefetch`
+        self._usage_details: dict[str, int] | None = None
 
     def __str__(self) -> str:
         return self.name
@@ -358,38 +483,85 @@ class Pool:
             return self.name < other.name
         return NotImplemented
 
-    @property
-    def usage_details(self) -> dict[str, int]:
-        """ Storage pool usage details (current - not cached) """
+    def prefetch(self) -> None:
+        """ Retrieve pool config and usage details concurrently, instead of
+        one after another on first use.
+
+        Prefetched usage details are used for the first access only (then
+        they are retrieved on each access again), so that other users of the
+        same Pool object do not get outdated values.
+        """
+        Pool.prefetch_many([self])
+
+    @staticmethod
+    def prefetch_many(pools: Iterable[Pool]) -> None:
+        """ Call :py:meth:`prefetch` for several pools at once, all the calls
+        are made concurrently.
+
+        Failures are ignored here, the data is then retrieved (and errors
+        reported) on first use.
+        """
+        pools = list(pools)
+        if not pools:
+            return
+        # pylint: disable=protected-access
+        with concurrent.futures.ThreadPoolExecutor(
+                min(32, 2 * len(pools))) as executor:
+            fetched = [(pool,
+                        executor.submit(pool._fetch_config),
+                        executor.submit(pool._fetch_usage_details))
+                       for pool in pools]
+        for pool, config, usage_details in fetched:
+            # pylint: disable=broad-except
+            try:
+                pool._config = config.result()
+            except Exception:
+                pass
+            try:
+                pool._usage_details = usage_details.result()
+            except Exception:
+                pass
+
+    def _fetch_usage_details(self) -> dict[str, int]:
+        """ Retrieve storage pool usage details """
         try:
             pool_usage_data = self.app.qubesd_call(
                 'dom0', 'admin.pool.UsageDetails', self.name, None)
         except qubesadmin.exc.QubesDaemonAccessError:
             raise qubesadmin.exc.QubesPropertyAccessError('usage_details')
-        pool_usage_data = pool_usage_data.decode('utf-8')
-        assert pool_usage_data.endswith('\n') or pool_usage_data == ''
+        assert pool_usage_data.endswith(b'\n') or pool_usage_data == b''
         pool_usage_data = pool_usage_data[:-1]
 
-        def _int_split(text: str) -> tuple[str, int]:  # pylint: disable=missing-docstring
-            key, value = text.split("=", 1)
-            return key, int(value)
+        def _int_split(text: bytes) -> tuple[str, int]:  # pylint: disable=missing-docstring
+            key, _, value = text.partition(b"=")
+            return key.decode('utf-8'), int(value)
 
         return dict(_int_split(l) for l in pool_usage_data.splitlines())
 
+    @property
+    def usage_details(self) -> dict[str, int]:
+        """ Storage pool usage details (current - not cached, unless
+        :py:meth:`prefetch` was just called) """
+        usage_details, self._usage_details = self._usage_details, None
+        if usage_details is not None:
+            return usage_details
+        return self._fetch_usage_details()
+
+    def _fetch_config(self) -> dict[str, str]:
+        """ Retrieve storage pool config """
+        try:
+            pool_info_data = self.app.qubesd_call(
+                'dom0', 'admin.pool.Info', self.name, None)
+        except qubesadmin.exc.QubesDaemonAccessError:
+            raise qubesadmin.exc.QubesPropertyAccessError('config')
+        assert pool_info_data.endswith(b'\n')
+        return _parse_info(pool_info_data, 'utf-8')
+
     @property
     def config(self) -> dict[str, str]:
         """ Storage pool config """
         if self._config is None:
-            try:
-                pool_info_data = self.app.qubesd_call(
-                    'dom0', 'admin.pool.Info', self.name, None)
-            except qubesadmin.exc.QubesDaemonAccessError:
-                raise qubesadmin.exc.QubesPropertyAccessError('config')
-            pool_info_data = pool_info_data.decode('utf-8')
-            assert pool_info_data.endswith('\n')
-            pool_info_data = pool_info_data[:-1]
-            self._config = dict(
-                l.split('=', 1) for l in pool_info_data.splitlines())
+            self._config = self._fetch_config()
         return self._config
 
     @property
@@ -410,7 +582,14 @@ class Pool:
             # pool driver does not provide usage information
             return None
 
-    @property
+    def size_and_usage(self) -> tuple[int | None, int | None]:
+        """ Storage pool size and space used in it, in bytes, retrieved
+        together in one call. Either may be None, if the pool driver does
+        not provide it. """
+        usage_details = self.usage_details
+        return usage_details.get('data_size'), usage_details.get('data_usage')
+
+    @functools.cached_property
     def driver(self) -> str:
         """ Storage pool driver """
         return self.config['driver']
@@ -427,14 +606,14 @@ class Pool:
             'dom0',
             'admin.pool.Set.revisions_to_keep',
             self.name,
-            str(value).encode('ascii'))
+            _encode_value(value))
         self._config = None
 
     @property
     def ephemeral_volatile(self) -> bool:
         """Whether volatile volumes in this pool should be encrypted with an
            ephemeral key in dom0"""
-        return bool(self.config['ephemeral_volatile'])
+        return self.config['ephemeral_volatile'] == 'True'
 
     @ephemeral_volatile.setter
     def ephemeral_volatile(self, value: object) -> None:
@@ -443,7 +622,7 @@ class Pool:
             'dom0',
             'admin.pool.Set.ephemeral_volatile',
             self.name,
-            str(value).encode('ascii'))
+            _encode_value(value))
         self._config = None
 
     @property
@@ -457,6 +636,31 @@ class Pool:
         if volumes_data == b'':
             return
         assert volumes_data.endswith(b'\n')
-        volumes_data = volumes_data[:-1].decode('ascii')
-        for vid in volumes_data.splitlines():
-            yield Volume(self.app, self.name, vid)
+        for vid in volumes_data[:-1].splitlines():
+            yield Volume(self.app, self.name, vid.decode('ascii'))
+
+    def volumes_with_info(self) -> Generator[tuple[Volume, VolumeInfo]]:
+        """ Volumes managed by this pool (see :py:attr:`volumes`), each with
+        a snapshot of its properties (see :py:meth:`Volume.info`), retrieved
+        all at once.
+
+        If qubesd refuses `admin.pool.volume.InfoAll`, properties are
+        retrieved for each volume separately.
+        """
+        try:
+            info_data = self.app.qubesd_call(
+                'dom0', 'admin.pool.volume.InfoAll', self.name, None)
+        except qubesadmin.exc.QubesDaemonAccessError:
+            for volume in self.volumes:
+                yield volume, volume.info()
+            return
+        # one block per volume: vid line, then its key=value lines;
+        # blocks are separated by an empty line
+        for block in info_data.split(b'\n\n'):
+            if not block:
+                continue
+            vid, _, info = block.partition(b'\n')
+            volume = Volume(self.app, self.name, vid.decode('ascii'))
+            # pylint: disable=protected-access
+            volume._info = _parse_info(info)
+            yield volume, volume._info_obj
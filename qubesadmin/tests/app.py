@@ -19,6 +19,7 @@
 
 # pylint: disable=missing-docstring
 
+import io
 import os
 import shutil
 import socket
@@ -397,14 +398,8 @@ class TC_10_QubesBase(qubesadmin.tests.QubesTestCase):
 
         # features
         self.app.expected_calls[
-            (src, 'admin.vm.feature.List', None, None)] = \
-            b'0\0feat1\nfeat2\n'
-        self.app.expected_calls[
-            (src, 'admin.vm.feature.Get', 'feat1', None)] = \
-            b'0\0feat1-value with spaces'
-        self.app.expected_calls[
-            (src, 'admin.vm.feature.Get', 'feat2', None)] = \
-            b'0\x001'
+            (src, 'admin.vm.feature.GetAll', None, None)] = \
+            b'0\0feat1 feat1-value with spaces\nfeat2 1\n'
         self.app.expected_calls[
             (dst, 'admin.vm.feature.Set', 'feat1',
             b'feat1-value with spaces')] = b'0\0'
@@ -912,7 +907,7 @@ class TC_10_QubesBase(qubesadmin.tests.QubesTestCase):
             ('test-vm', 'admin.vm.tag.List', None, None)] = \
             b'0\0'
         self.app.expected_calls[
-            ('test-vm', 'admin.vm.feature.List', None, None)] = \
+            ('test-vm', 'admin.vm.feature.GetAll', None, None)] = \
             b'0\0'
         self.app.expected_calls[('dom0', 'admin.vm.List', None, None)] = \
             b'0\x00new-name class=AppVM state=Halted\n' \
@@ -986,6 +981,57 @@ class TC_10_QubesBase(qubesadmin.tests.QubesTestCase):
         with self.assertRaises(ValueError):
             self.app.add_new_vm('AppVM', 'VM Name with spaces', 'red')
 
+    def test_060_batching(self):
+        self.app.expected_calls[('dom0', 'admin.batch.Execute', None,
+                b'27\0admin.vm.CurrentState+ vm1\0'
+                b'32\0admin.vm.property.Get+label vm2\0')] = \
+            b'0\x00' \
+            b'21\x000\x00power_state=Running' \
+            b'51\x002\x00QubesNoSuchPropertyError\x00\x00Invalid property ' \
+            b'label\x00'
+        with self.app.batching():
+            state = self.app.qubesd_call_async('vm1', 'admin.vm.CurrentState')
+            label = self.app.qubesd_call_async(
+                'vm2', 'admin.vm.property.Get', 'label')
+            self.assertFalse(state.done())
+        self.assertEqual(state.result(), b'power_state=Running')
+        with self.assertRaises(qubesadmin.exc.QubesNoSuchPropertyError):
+            label.result()
+        self.assertAllCalled()
+
+    def test_061_batching_fallback(self):
+        self.app.expected_calls[('dom0', 'admin.batch.Execute', None,
+                b'27\0admin.vm.CurrentState+ vm1\0')] = b''
+        self.app.expected_calls[('vm1', 'admin.vm.CurrentState', None,
+                None)] = b'0\x00power_state=Running'
+        with self.app.batching():
+            state = self.app.qubesd_call_async('vm1', 'admin.vm.CurrentState')
+        self.assertEqual(state.result(), b'power_state=Running')
+        self.assertAllCalled()
+
+    def test_062_batching_exception(self):
+        with self.assertRaises(ValueError):
+            with self.app.batching():
+                state = self.app.qubesd_call_async(
+                    'vm1', 'admin.vm.CurrentState')
+                raise ValueError
+        self.assertTrue(state.cancelled())
+        self.app.flush_pending()
+        self.assertAllCalled()
+
+    def test_063_batching_error(self):
+        self.app.expected_calls[('dom0', 'admin.batch.Execute', None,
+                b'27\0admin.vm.CurrentState+ vm1\0')] = \
+            b'2\x00QubesException\x00\x00An error occurred\x00'
+        with self.assertRaises(qubesadmin.exc.QubesException):
+            with self.app.batching():
+                state = self.app.qubesd_call_async(
+                    'vm1', 'admin.vm.CurrentState')
+        self.assertTrue(state.done())
+        with self.assertRaises(qubesadmin.exc.QubesException):
+            state.result()
+        self.assertAllCalled()
+
 
 class TC_20_QubesLocal(unittest.TestCase):
     def setUp(self):
@@ -1077,6 +1123,13 @@ class TC_20_QubesLocal(unittest.TestCase):
                 payload_file, payload=b'first line\n',
                 expected=b'first line\nsome payload\n')
 
+    def test_006_qubesd_call_payload_stream_proc_with_prefix(self):
+        with subprocess.Popen(['echo', 'some payload'],
+                              stdout=subprocess.PIPE) as echo:
+            self._call_test_service_with_payload_stream(
+                echo.stdout, payload=b'first line\n',
+                expected=b'first line\nsome payload\n')
+
     def _call_test_service_with_payload_stream(
             self, payload_stream, payload=None, expected=b''):
         service_path = os.path.join(self.tmpdir, 'test.service')
@@ -1254,6 +1307,9 @@ class TC_30_QubesRemote(unittest.TestCase):
 
     def test_004_qubesd_call_payload_stream_with_prefix(self):
         self.set_proc_stdout(b'0\0return-value')
+        # mocked stdin has no file descriptor, data is copied in userspace
+        self.proc_mock.return_value.stdin.fileno.side_effect = \
+            io.UnsupportedOperation
         tmpdir = tempfile.mkdtemp()
         self.addCleanup(shutil.rmtree, tmpdir)
 
@@ -1273,6 +1329,8 @@ class TC_30_QubesRemote(unittest.TestCase):
                 stderr=subprocess.PIPE),
             mock.call().__enter__(),
             mock.call().stdin.write(b'first line\n'),
+            mock.call().stdin.flush(),
+            mock.call().stdin.fileno(),
             mock.call().stdin.write(b'some payload\n'),
             mock.call().communicate(),
             mock.call().__exit__(None, None, None),
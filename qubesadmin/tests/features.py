@@ -41,6 +41,53 @@ class TC_00_Features(qubesadmin.tests.QubesTestCase):
             ['feature1', 'feature2'])
         self.assertAllCalled()
 
+    def test_001_items(self):
+        self.app.expected_calls[
+            ('test-vm', 'admin.vm.feature.GetAll', None, None)] = \
+            b'0\0feature1 value1\nfeature2 \nfeature3 line1\\nline2\n'
+        self.assertEqual(list(self.vm.features.items()),
+            [('feature1', 'value1'), ('feature2', ''),
+             ('feature3', 'line1\nline2')])
+        self.assertAllCalled()
+
+    def test_002_items_fallback(self):
+        self.app.expected_calls[
+            ('test-vm', 'admin.vm.feature.GetAll', None, None)] = b''
+        self.app.expected_calls[
+            ('test-vm', 'admin.vm.feature.List', None, None)] = \
+            b'0\0feature1\nfeature2\n'
+        self.app.expected_calls[
+            ('test-vm', 'admin.vm.feature.Get', 'feature1', None)] = \
+            b'0\0value1'
+        self.app.expected_calls[
+            ('test-vm', 'admin.vm.feature.Get', 'feature2', None)] = \
+            b'0\0'
+        self.assertEqual(list(self.vm.features.items()),
+            [('feature1', 'value1'), ('feature2', '')])
+        self.assertAllCalled()
+
+    def test_003_items_prefix(self):
+        self.app.expected_calls[
+            ('test-vm', 'admin.vm.feature.GetAll', None, None)] = \
+            b'0\0feature1 value1\nservice.feature2 value2\n'
+        self.assertEqual(list(self.vm.features.items('service.')),
+            [('service.feature2', 'value2')])
+        self.assertAllCalled()
+
+    def test_004_items_fallback_remembered(self):
+        self.app.expected_calls[
+            ('test-vm', 'admin.vm.feature.GetAll', None, None)] = [b'']
+        self.app.expected_calls[
+            ('test-vm', 'admin.vm.feature.List', None, None)] = \
+            b'0\0feature1\nservice.feature2\n'
+        self.app.expected_calls[
+            ('test-vm', 'admin.vm.feature.Get', 'service.feature2', None)] = \
+            b'0\0value2'
+        for _ in range(2):
+            self.assertEqual(list(self.vm.features.items('service.')),
+                [('service.feature2', 'value2')])
+        self.assertAllCalled()
+
     def test_010_get(self):
         self.app.expected_calls[
             ('test-vm', 'admin.vm.feature.Get', 'feature1', None)] = \
@@ -72,6 +119,28 @@ class TC_00_Features(qubesadmin.tests.QubesTestCase):
         self.assertEqual(self.vm.features.get('feature1', 'other'), 'other')
         self.assertAllCalled()
 
+    def test_014_get_raw(self):
+        self.app.expected_calls[
+            ('test-vm', 'admin.vm.feature.Get', 'feature1', None)] = \
+            b'0\0value1'
+        self.assertEqual(self.vm.features.get_raw('feature1'), b'value1')
+        self.assertAllCalled()
+
+    def test_015_get_raw_default(self):
+        self.app.expected_calls[
+            ('test-vm', 'admin.vm.feature.Get', 'feature1', None)] = \
+            b'2\x00QubesFeatureNotFoundError\x00\x00feature1\x00'
+        self.assertIsNone(self.vm.features.get_raw('feature1'))
+        self.assertAllCalled()
+
+    def test_016_check_with_template_raw(self):
+        self.app.expected_calls[
+            ('test-vm', 'admin.vm.feature.CheckWithTemplate', 'feature1',
+             None)] = b'0\0'
+        self.assertEqual(
+            self.vm.features.check_with_template_raw('feature1', True), b'')
+        self.assertAllCalled()
+
     def test_020_set(self):
         self.app.expected_calls[
             ('test-vm', 'admin.vm.feature.Set', 'feature1', b'value')] = \
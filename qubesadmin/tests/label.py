@@ -26,13 +26,16 @@ from qubesadmin.label import Label
 class TC_00_Label(qubesadmin.tests.QubesTestCase):
     def test_000_list(self):
         self.app.expected_calls[
-            ('dom0', 'admin.label.List', None, None)] = \
-            b'0\x00green\nred\nblack\n'
+            ('dom0', 'admin.label.ListFull', None, None)] = \
+            b'0\x00green 0x00FF00 4\nred 0xcc0000 1\nblack 0x000000 8\n'
         seen = set()
         for label in self.app.labels.values():
             self.assertNotIn(label.name, seen)
             seen.add(label.name)
         self.assertEqual(seen, {'green', 'red', 'black'})
+        self.assertEqual(self.app.labels['green'].color, '0x00FF00')
+        self.assertEqual(self.app.labels['black'].index, 8)
+        self.assertAllCalled()
 
     def test_001_list_names(self):
         self.app.expected_calls[
@@ -55,6 +58,8 @@ class TC_00_Label(qubesadmin.tests.QubesTestCase):
         self.assertEqual(seen, {'green', 'red', 'black'})
 
     def test_003_list_items(self):
+        self.app.expected_calls[
+            ('dom0', 'admin.label.ListFull', None, None)] = b''
         self.app.expected_calls[
             ('dom0', 'admin.label.List', None, None)] = \
             b'0\x00green\nred\nblack\n'
@@ -65,6 +70,18 @@ class TC_00_Label(qubesadmin.tests.QubesTestCase):
             seen.add(name)
         self.assertEqual(seen, {'green', 'red', 'black'})
 
+    def test_004_refresh_drop_removed(self):
+        self.app.expected_calls[
+            ('dom0', 'admin.label.List', None, None)] = \
+            [b'0\x00green\nred\n', b'0\x00green\n']
+        green = self.app.labels['green']
+        red = self.app.labels['red']
+        self.app.labels.refresh_cache(force=True)
+        self.assertEqual(self.app.labels.keys(), ['green'])
+        self.assertIs(self.app.labels['green'], green)
+        self.assertIsNot(self.app.labels.get_blind('red'), red)
+        self.assertAllCalled()
+
     def test_010_get(self):
         self.app.expected_calls[
             ('dom0', 'admin.label.List', None, None)] = \
@@ -92,6 +109,18 @@ class TC_00_Label(qubesadmin.tests.QubesTestCase):
         label = self.app.labels['green']
         self.assertEqual(label.index, 3)
 
+    def test_013_get_color_cached(self):
+        self.app.expected_calls[
+            ('dom0', 'admin.label.List', None, None)] = \
+            b'0\x00green\nred\nblack\n'
+        self.app.expected_calls[
+            ('dom0', 'admin.label.Get', 'green', None)] = \
+            [b'0\x000x00FF00']
+        label = self.app.labels['green']
+        self.assertEqual(label.color, '0x00FF00')
+        self.assertEqual(label.color, '0x00FF00')
+        self.assertAllCalled()
+
     def test_024_get_icon(self):
         self.app.expected_calls[
             ('dom0', 'admin.label.List', None, None)] = \
@@ -534,6 +534,16 @@ class MockQube:
         ] = (
             "0\x00" + "".join(f"{feature}\n" for feature in self.features)
         ).encode()
+        self.qapp.expected_calls[
+            (self.name, "admin.vm.feature.GetAll", None, None)
+        ] = (
+            "0\x00" + "".join(
+                "{} {}\n".format(
+                    feature,
+                    str(value).replace("\\", "\\\\").replace("\n", "\\n"))
+                for feature, value in self.features.items()
+                if value is not None)
+        ).encode()
 
         # setup all volumeInfo related calls
         self.setup_volume_calls()
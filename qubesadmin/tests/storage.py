@@ -21,6 +21,7 @@
 
 import subprocess
 
+import qubesadmin.exc
 import qubesadmin.tests
 import qubesadmin.storage
 
@@ -47,6 +48,11 @@ class TestVMVolume(qubesadmin.tests.QubesTestCase):
             b'source=\n' \
             b'revisions_to_keep=3\n'
 
+    def expect_set(self, prop, value):
+        self.app.expected_calls[
+            ('test-vm', 'admin.vm.volume.Set.' + prop, 'volname', value)] = \
+            b'0\x00'
+
     def test_000_qubesd_call(self):
         self.app.expected_calls[
             ('test-vm', 'admin.vm.volume.TestMethod', 'volname', None)] = \
@@ -134,6 +140,67 @@ class TestVMVolume(qubesadmin.tests.QubesTestCase):
         self.assertEqual(self.vol.revisions, [])
         self.assertAllCalled()
 
+    def test_023_info_cached(self):
+        self.expect_info()
+        call_key = list(self.app.expected_calls)[0]
+        info = self.app.expected_calls[call_key]
+        self.app.expected_calls[call_key] = [
+            info, info.replace(b'usage=512', b'usage=768')]
+        # properties which cannot change are retrieved once...
+        self.assertEqual(self.vol.save_on_stop, True)
+        self.assertEqual(self.vol.snap_on_start, True)
+        # ... others (including source, changed with the template) on every
+        # access
+        self.assertEqual(self.vol.usage, 768)
+        self.assertAllCalled()
+
+    def test_024_set_rereads_info(self):
+        self.expect_info()
+        call_key = list(self.app.expected_calls)[0]
+        info = self.app.expected_calls[call_key]
+        self.app.expected_calls[call_key] = [
+            info, info.replace(b'rw=True', b'rw=False')]
+        self.expect_set('rw', b'False')
+        self.assertEqual(self.vol.rw, True)
+        self.vol.rw = False
+        self.assertEqual(self.vol.rw, False)
+        self.assertAllCalled()
+
+    def test_026_info_async(self):
+        self.expect_info()
+        call_key, info = self.app.expected_calls.popitem()
+        dest, method, arg, payload = call_key
+        entry = '{}+{} {}\0'.format(method, arg, dest).encode() + \
+            (payload or b'')
+        self.app.expected_calls[
+            ('dom0', 'admin.batch.Execute', None,
+             b'%d\0' % len(entry) + entry)] = \
+            b'0\x00' + b'%d\0' % len(info) + info
+        with self.app.batching():
+            info = self.vol.info_async()
+        self.assertEqual((info.result().size, info.result().usage),
+            (1024, 512))
+        self.assertEqual(self.vol.save_on_stop, True)
+        self.assertAllCalled()
+
+    def test_027_iter_revisions(self):
+        self.app.expected_calls[
+            ('test-vm', 'admin.vm.volume.ListSnapshots', 'volname', None)] = \
+            b'0\x00snapid1\nsnapid2\n'
+        revisions = self.vol.iter_revisions()
+        self.assertEqual(next(revisions), 'snapid1')
+        self.assertEqual(list(revisions), ['snapid2'])
+        self.assertAllCalled()
+
+    def test_028_info_snapshot(self):
+        self.expect_info()
+        call_key = list(self.app.expected_calls)[0]
+        self.app.expected_calls[call_key] = [self.app.expected_calls[call_key]]
+        info = self.vol.info()
+        self.assertEqual((info.size, info.usage, info.rw), (1024, 512, True))
+        self.assertEqual(self.vol.save_on_stop, True)
+        self.assertAllCalled()
+
     def test_030_resize(self):
         self.app.expected_calls[
             ('test-vm', 'admin.vm.volume.Resize', 'volname', b'2048')] = \
@@ -180,6 +247,11 @@ class TestPoolVolume(TestVMVolume):
         self.vol = qubesadmin.storage.Volume(self.app, pool='test-pool',
             vid='some-id')
 
+    def expect_set(self, prop, value):
+        self.app.expected_calls[
+            ('dom0', 'admin.pool.volume.Set.' + prop, 'test-pool',
+             b'some-id ' + value)] = b'0\x00'
+
     def test_000_qubesd_call(self):
         self.app.expected_calls[
             ('dom0', 'admin.pool.volume.TestMethod',
@@ -241,6 +313,16 @@ class TestPoolVolume(TestVMVolume):
         self.assertEqual(self.vol.revisions, [])
         self.assertAllCalled()
 
+    def test_027_iter_revisions(self):
+        self.app.expected_calls[
+            ('dom0', 'admin.pool.volume.ListSnapshots',
+             'test-pool', b'some-id')] = \
+            b'0\x00snapid1\nsnapid2\n'
+        revisions = self.vol.iter_revisions()
+        self.assertEqual(next(revisions), 'snapid1')
+        self.assertEqual(list(revisions), ['snapid2'])
+        self.assertAllCalled()
+
     def test_030_resize(self):
         self.app.expected_calls[
             ('dom0', 'admin.pool.volume.Resize',
@@ -337,6 +419,103 @@ class TestPool(qubesadmin.tests.QubesTestCase):
         self.assertEqual(pool.usage, 102400)
         self.assertAllCalled()
 
+    def test_013_config_values(self):
+        self.app.expected_calls[('dom0', 'admin.pool.List', None, None)] = \
+            b'0\x00file\nlvm\n'
+        self.app.expected_calls[('dom0', 'admin.pool.Info', 'file', None)] = \
+            [b'0\x00driver=file\n'
+            b'ephemeral_volatile=False\n'
+            b'revisions_to_keep=3\n']
+        pool = self.app.pools['file']
+        self.assertEqual(pool.driver, 'file')
+        self.assertIs(pool.ephemeral_volatile, False)
+        self.assertEqual(pool.revisions_to_keep, 3)
+        self.assertEqual(pool.driver, 'file')
+        self.assertAllCalled()
+
+    def test_014_prefetch(self):
+        self.app.expected_calls[('dom0', 'admin.pool.List', None, None)] = \
+            b'0\x00file\nlvm\n'
+        self.app.expected_calls[('dom0', 'admin.pool.Info', 'lvm', None)] = \
+            [b'0\x00driver=lvm_thin\nrevisions_to_keep=2\n']
+        self.app.expected_calls[
+            ('dom0', 'admin.pool.UsageDetails', 'lvm', None)] = \
+            [b'0\x00data_size=204800\ndata_usage=102400\n']
+        pool = self.app.pools['lvm']
+        pool.prefetch()
+        self.assertEqual(pool.driver, 'lvm_thin')
+        self.assertEqual(pool.revisions_to_keep, 2)
+        self.assertEqual(pool.size_and_usage(), (204800, 102400))
+        self.assertAllCalled()
+        # prefetched usage details are used only once
+        self.app.expected_calls[
+            ('dom0', 'admin.pool.UsageDetails', 'lvm', None)] = \
+            [b'0\x00data_size=204800\ndata_usage=153600\n']
+        self.assertEqual(pool.usage, 153600)
+        self.assertAllCalled()
+
+    def test_015_prefetch_many_error(self):
+        self.app.expected_calls[('dom0', 'admin.pool.List', None, None)] = \
+            b'0\x00file\nlvm\n'
+        self.app.expected_calls[('dom0', 'admin.pool.Info', 'file', None)] = \
+            b'0\x00driver=file\n'
+        self.app.expected_calls[
+            ('dom0', 'admin.pool.UsageDetails', 'file', None)] = b''
+        self.app.expected_calls[('dom0', 'admin.pool.Info', 'lvm', None)] = \
+            b'0\x00driver=lvm_thin\n'
+        self.app.expected_calls[
+            ('dom0', 'admin.pool.UsageDetails', 'lvm', None)] = \
+            b'0\x00data_size=204800\ndata_usage=102400\n'
+        pools = [self.app.pools['file'], self.app.pools['lvm']]
+        qubesadmin.storage.Pool.prefetch_many(pools)
+        self.assertEqual(pools[0].driver, 'file')
+        self.assertEqual(pools[1].usage, 102400)
+        with self.assertRaises(qubesadmin.exc.QubesPropertyAccessError):
+            pools[0].usage_details  # pylint: disable=pointless-statement
+        self.assertAllCalled()
+
+    def test_016_config_shared(self):
+        self.app.expected_calls[('dom0', 'admin.pool.List', None, None)] = \
+            [b'0\x00file\nlvm\n', b'0\x00file\nlvm\n']
+        self.app.expected_calls[('dom0', 'admin.pool.Info', 'file', None)] = \
+            [b'0\x00driver=file\n']
+        self.assertEqual(self.app.pools['file'].driver, 'file')
+        self.app.pools.refresh_cache(force=True)
+        self.assertEqual(self.app.pools['file'].config, {'driver': 'file'})
+        self.assertAllCalled()
+
+    def test_017_size_and_usage_one_call(self):
+        self.app.expected_calls[('dom0', 'admin.pool.List', None, None)] = \
+            b'0\x00file\nlvm\n'
+        self.app.expected_calls[
+            ('dom0', 'admin.pool.UsageDetails', 'lvm', None)] = \
+            [b'0\x00data_size=204800\ndata_usage=102400\n']
+        self.app.expected_calls[
+            ('dom0', 'admin.pool.UsageDetails', 'file', None)] = \
+            [b'0\x00']
+        self.assertEqual(self.app.pools['lvm'].size_and_usage(),
+            (204800, 102400))
+        self.assertEqual(self.app.pools['file'].size_and_usage(),
+            (None, None))
+        self.assertAllCalled()
+
+    def test_018_prefetch_many_malformed(self):
+        self.app.expected_calls[('dom0', 'admin.pool.List', None, None)] = \
+            b'0\x00file\nlvm\n'
+        self.app.expected_calls[('dom0', 'admin.pool.Info', 'file', None)] = \
+            [b'0\x00driver=file'] * 2
+        self.app.expected_calls[
+            ('dom0', 'admin.pool.UsageDetails', 'file', None)] = \
+            [b'0\x00data_size=204800'] * 2
+        pool = self.app.pools['file']
+        qubesadmin.storage.Pool.prefetch_many([pool])
+        # the malformed replies are reported on first use
+        with self.assertRaises(AssertionError):
+            pool.config  # pylint: disable=pointless-statement
+        with self.assertRaises(AssertionError):
+            pool.usage_details  # pylint: disable=pointless-statement
+        self.assertAllCalled()
+
     def test_020_volumes(self):
         self.app.expected_calls[('dom0', 'admin.pool.List', None, None)] = \
             b'0\x00file\nlvm\n'
@@ -356,6 +535,50 @@ class TestPool(qubesadmin.tests.QubesTestCase):
         self.assertEqual(seen, {'vol1', 'vol2'})
         self.assertAllCalled()
 
+    def test_021_volumes_with_info(self):
+        self.app.expected_calls[('dom0', 'admin.pool.List', None, None)] = \
+            b'0\x00file\nlvm\n'
+        self.app.expected_calls[
+            ('dom0', 'admin.pool.volume.InfoAll', 'file', None)] = \
+            b'0\x00vol1\n' \
+            b'size=1024\n' \
+            b'usage=512\n' \
+            b'\n' \
+            b'vol2\n' \
+            b'size=2048\n' \
+            b'usage=0\n' \
+            b'\n'
+        pool = self.app.pools['file']
+        volumes = list(pool.volumes_with_info())
+        self.assertEqual([v.vid for v, _ in volumes], ['vol1', 'vol2'])
+        self.assertEqual([(i.size, i.usage) for _, i in volumes],
+            [(1024, 512), (2048, 0)])
+        self.assertAllCalled()
+        # reading the volume itself gets current values
+        self.app.expected_calls[
+            ('dom0', 'admin.pool.volume.Info', 'file', b'vol1')] = \
+            b'0\x00size=1024\nusage=768\n'
+        self.assertEqual(volumes[0][0].usage, 768)
+        self.assertAllCalled()
+
+    def test_022_volumes_with_info_fallback(self):
+        self.app.expected_calls[('dom0', 'admin.pool.List', None, None)] = \
+            b'0\x00file\nlvm\n'
+        self.app.expected_calls[
+            ('dom0', 'admin.pool.volume.InfoAll', 'file', None)] = b''
+        self.app.expected_calls[
+            ('dom0', 'admin.pool.volume.List', 'file', None)] = \
+            b'0\x00vol1\n'
+        self.app.expected_calls[
+            ('dom0', 'admin.pool.volume.Info', 'file', b'vol1')] = \
+            b'0\x00size=1024\nusage=512\n'
+        pool = self.app.pools['file']
+        volumes = list(pool.volumes_with_info())
+        self.assertEqual([v.vid for v, _ in volumes], ['vol1'])
+        self.assertEqual((volumes[0][1].size, volumes[0][1].usage),
+            (1024, 512))
+        self.assertAllCalled()
+
     def test_030_pool_drivers(self):
         self.app.expected_calls[
             ('dom0', 'admin.pool.ListDrivers', None, None)] = \
@@ -379,3 +602,16 @@ class TestPool(qubesadmin.tests.QubesTestCase):
             ('dom0', 'admin.pool.Remove', 'test-pool', None)] = b'0\x00'
         self.app.remove_pool('test-pool')
         self.assertAllCalled()
+
+    def test_060_volume_sort_key(self):
+        volumes = [
+            qubesadmin.storage.Volume(self.app, vm='test-vm', vm_name='root'),
+            qubesadmin.storage.Volume(self.app, vm='a-vm', vm_name='root'),
+            qubesadmin.storage.Volume(self.app, vm='test-vm',
+                vm_name='private'),
+        ]
+        by_key = sorted(volumes, key=lambda v: v.sort_key)
+        self.assertEqual([id(v) for v in by_key],
+            [id(v) for v in sorted(volumes)])
+        self.assertEqual([id(v) for v in by_key],
+            [id(volumes[1]), id(volumes[2]), id(volumes[0])])
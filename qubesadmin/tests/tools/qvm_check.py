@@ -71,9 +71,6 @@ class TC_00_qvm_check(qubesadmin.tests.QubesTestCase):
             b'0\x00some-vm class=AppVM state=Running\n' \
             b'some-vm2 class=AppVM state=Running\n' \
             b'some-vm3 class=AppVM state=Halted\n'
-        self.app.expected_calls[
-            ('some-vm', 'admin.vm.CurrentState', None, None)] = \
-            b'0\x00power_state=Running'
         with self.assertLogs() as logger:
             self.assertEqual(
                 qubesadmin.tools.qvm_check.main(['--running', 'some-vm'],
@@ -87,12 +84,6 @@ class TC_00_qvm_check(qubesadmin.tests.QubesTestCase):
             b'0\x00some-vm class=AppVM state=Running\n' \
             b'some-vm2 class=AppVM state=Running\n' \
             b'some-vm3 class=AppVM state=Halted\n'
-        self.app.expected_calls[
-            ('some-vm', 'admin.vm.CurrentState', None, None)] = \
-            b'0\x00power_state=Running'
-        self.app.expected_calls[
-            ('some-vm2', 'admin.vm.CurrentState', None, None)] = \
-            b'0\x00power_state=Running'
         with self.assertLogs() as logger:
             self.assertEqual(qubesadmin.tools.qvm_check.main(
                 ['--running', 'some-vm', 'some-vm2'], app=self.app), 0)
@@ -107,15 +98,6 @@ class TC_00_qvm_check(qubesadmin.tests.QubesTestCase):
             b'0\x00some-vm class=AppVM state=Running\n' \
             b'some-vm2 class=AppVM state=Running\n' \
             b'some-vm3 class=AppVM state=Halted\n'
-        self.app.expected_calls[
-            ('some-vm', 'admin.vm.CurrentState', None, None)] = \
-            b'0\x00power_state=Running'
-        self.app.expected_calls[
-            ('some-vm2', 'admin.vm.CurrentState', None, None)] = \
-            b'0\x00power_state=Running'
-        self.app.expected_calls[
-            ('some-vm3', 'admin.vm.CurrentState', None, None)] = \
-            b'0\x00power_state=Halted'
         with self.assertLogs() as logger:
             self.assertEqual(
                 qubesadmin.tools.qvm_check.main(['--running', '--all'],
@@ -131,9 +113,6 @@ class TC_00_qvm_check(qubesadmin.tests.QubesTestCase):
             b'0\x00some-vm class=AppVM state=Running\n' \
             b'some-vm2 class=AppVM state=Running\n' \
             b'some-vm3 class=AppVM state=Halted\n'
-        self.app.expected_calls[
-            ('some-vm3', 'admin.vm.CurrentState', None, None)] = \
-            b'0\x00power_state=Halted'
         with self.assertLogs() as logger:
             self.assertEqual(
                 qubesadmin.tools.qvm_check.main(['--running', 'some-vm3'],
@@ -148,9 +127,6 @@ class TC_00_qvm_check(qubesadmin.tests.QubesTestCase):
             b'0\x00some-vm class=AppVM state=Running\n' \
             b'some-vm2 class=AppVM state=Paused\n' \
             b'some-vm3 class=AppVM state=Halted\n'
-        self.app.expected_calls[
-            ('some-vm2', 'admin.vm.CurrentState', None, None)] = \
-            b'0\x00power_state=Paused'
         with self.assertLogs() as logger:
             self.assertEqual(
                 qubesadmin.tools.qvm_check.main(['--paused', 'some-vm2'],
@@ -164,12 +140,6 @@ class TC_00_qvm_check(qubesadmin.tests.QubesTestCase):
             b'0\x00some-vm class=AppVM state=Running\n' \
             b'some-vm2 class=AppVM state=Paused\n' \
             b'some-vm3 class=AppVM state=Halted\n'
-        self.app.expected_calls[
-            ('some-vm2', 'admin.vm.CurrentState', None, None)] = \
-            b'0\x00power_state=Paused'
-        self.app.expected_calls[
-            ('some-vm', 'admin.vm.CurrentState', None, None)] = \
-            b'0\x00power_state=Running'
         with self.assertLogs() as logger:
             self.assertEqual(qubesadmin.tools.qvm_check.main(
                 ['--paused', 'some-vm2', 'some-vm'], app=self.app), 3)
@@ -209,11 +179,10 @@ class TC_00_qvm_check(qubesadmin.tests.QubesTestCase):
             b'0\x00some-vm class=AppVM state=Running\n' \
             b'some-vm2 class=AppVM state=Running\n'
         self.app.expected_calls[
-            ('some-vm2', 'admin.vm.property.Get', 'provides_network', None)] = \
-            b'0\x00default=false type=bool false'
-        self.app.expected_calls[
-            ('some-vm2', 'admin.vm.property.Get', 'netvm', None)] = \
-            b'0\x00default=false type=vm some-vm'
+            ('some-vm2', 'admin.vm.property.GetAll', None, None)] = \
+            b'0\x00' \
+            b'netvm default=false type=vm some-vm\n' \
+            b'provides_network default=false type=bool false\n'
         with self.assertLogs() as logger:
             self.assertEqual(
                 qubesadmin.tools.qvm_check.main(['--networked', 'some-vm2'],
@@ -229,17 +198,15 @@ class TC_00_qvm_check(qubesadmin.tests.QubesTestCase):
             b'some-vm2 class=AppVM state=Running\n' \
             b'some-vm3 class=TemplateVM state=Halted\n'
         self.app.expected_calls[
-            ('some-vm2', 'admin.vm.property.Get', 'provides_network', None)] = \
-            b'0\x00default=false type=bool false'
+            ('some-vm2', 'admin.vm.property.GetAll', None, None)] = \
+            b'0\x00' \
+            b'netvm default=false type=vm some-vm\n' \
+            b'provides_network default=false type=bool false\n'
         self.app.expected_calls[
-            ('some-vm3', 'admin.vm.property.Get', 'provides_network', None)] = \
-            b'0\x00default=false type=bool false'
-        self.app.expected_calls[
-            ('some-vm2', 'admin.vm.property.Get', 'netvm', None)] = \
-            b'0\x00default=false type=vm some-vm'
-        self.app.expected_calls[
-            ('some-vm3', 'admin.vm.property.Get', 'netvm', None)] = \
-            b"0\x00default=false type=vm "
+            ('some-vm3', 'admin.vm.property.GetAll', None, None)] = \
+            b'0\x00' \
+            b'netvm default=false type=vm \n' \
+            b'provides_network default=false type=bool false\n'
         with self.assertLogs() as logger:
             self.assertEqual(qubesadmin.tools.qvm_check.main(
                 ['--networked', 'some-vm2', 'some-vm3'], app=self.app), 3)
@@ -264,3 +231,37 @@ class TC_00_qvm_check(qubesadmin.tests.QubesTestCase):
             b'0\x00some-vm class=AppVM state=Running\n'
         with self.assertRaises(SystemExit):
             qubesadmin.tools.qvm_check.main(['--invalid-option'], app=self.app)
+
+    def test_016_parallelism(self):
+        self.app.expected_calls[
+            ('dom0', 'admin.vm.List', None, None)] = \
+            b'0\x00some-vm class=AppVM state=Running\n' \
+            b'some-vm2 class=AppVM state=Running\n'
+        self.app.expected_calls[
+            ('some-vm2', 'admin.vm.property.GetAll', None, None)] = \
+            b'0\x00' \
+            b'netvm default=false type=vm some-vm\n' \
+            b'provides_network default=false type=bool false\n'
+        self.assertEqual(qubesadmin.tools.qvm_check.main(
+            ['--networked', '--parallelism', '1', 'some-vm2'],
+            app=self.app), 0)
+        self.assertAllCalled()
+
+    def test_017_parallelism_invalid(self):
+        self.app.expected_calls[
+            ('dom0', 'admin.vm.List', None, None)] = \
+            b'0\x00some-vm class=AppVM state=Running\n'
+        for value in ('0', '-1', 'x'):
+            with self.subTest(value=value):
+                with self.assertRaises(SystemExit):
+                    qubesadmin.tools.qvm_check.main(
+                        ['--networked', '--parallelism', value, 'some-vm'],
+                        app=self.app)
+
+    def test_018_networked_no_qubes(self):
+        self.app.expected_calls[
+            ('dom0', 'admin.vm.List', None, None)] = \
+            b'0\x00dom0 class=AdminVM state=Running\n'
+        self.assertEqual(qubesadmin.tools.qvm_check.main(
+            ['--networked', '--all'], app=self.app), 0)
+        self.assertAllCalled()
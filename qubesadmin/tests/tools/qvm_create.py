@@ -205,7 +205,7 @@ class TC_00_qvm_create(qubesadmin.tests.QubesTestCase):
             ('template', 'admin.vm.tag.List', None, None)] = \
             b'0\x00'
         self.app.expected_calls[
-            ('template', 'admin.vm.feature.List', None, None)] = \
+            ('template', 'admin.vm.feature.GetAll', None, None)] = \
             b'0\x00'
         self.app.expected_calls[
             ('template', 'admin.vm.firewall.Get', None, None)] = \
@@ -28,6 +28,8 @@ class TC_00_qvm_features(qubesadmin.tests.QubesTestCase):
         self.app.expected_calls[
             ('dom0', 'admin.vm.List', None, None)] = \
             b'0\x00some-vm class=AppVM state=Running\n'
+        self.app.expected_calls[
+            ('some-vm', 'admin.vm.feature.GetAll', None, None)] = b''
         self.app.expected_calls[
             ('some-vm', 'admin.vm.feature.List', None, None)] = \
             b'0\x00feature1\nfeature2\n'
@@ -32,14 +32,9 @@ class TC_00_qvm_service(qubesadmin.tests.QubesTestCase):
             ('dom0', 'admin.vm.List', None, None)] = \
             b'0\x00some-vm class=AppVM state=Running\n'
         self.app.expected_calls[
-            ('some-vm', 'admin.vm.feature.List', None, None)] = \
-            b'0\x00feature1\nservice.service1\nservice.service2\n'
-        self.app.expected_calls[
-            ('some-vm', 'admin.vm.feature.Get', 'service.service1', None)] = \
-            b'0\x00value1'
-        self.app.expected_calls[
-            ('some-vm', 'admin.vm.feature.Get', 'service.service2', None)] = \
-            b'0\x00'
+            ('some-vm', 'admin.vm.feature.GetAll', None, None)] = \
+            b'0\x00feature1 value\nservice.service1 value1\n' \
+            b'service.service2 \n'
         with qubesadmin.tests.tools.StdoutBuffer() as stdout:
             self.assertEqual(
                 qubesadmin.tools.qvm_service.main(['some-vm'], app=self.app),
@@ -53,6 +48,8 @@ class TC_00_qvm_service(qubesadmin.tests.QubesTestCase):
         self.app.expected_calls[
             ('dom0', 'admin.vm.List', None, None)] = \
             b'0\x00some-vm class=AppVM state=Running\n'
+        self.app.expected_calls[
+            ('some-vm', 'admin.vm.feature.GetAll', None, None)] = b''
         self.app.expected_calls[
             ('some-vm', 'admin.vm.feature.List', None, None)] = \
             b'0\x00feature1\nservice.service1\nservice.service2\n'
@@ -194,6 +194,14 @@ class TC_00_Properties(qubesadmin.tests.vm.VMTestCase):
             self.vm.property_get_default('prop1')
         self.assertAllCalled()
 
+    def test_043_get_default_empty_int(self):
+        self.app.expected_calls[
+            ('test-vm', 'admin.vm.property.GetDefault', 'prop1', None)] = \
+            b'0\x00type=int '
+        with self.assertRaises(AttributeError):
+            self.vm.property_get_default('prop1')
+        self.assertAllCalled()
+
     def test_050_get_all(self):
         self.app.expected_calls[
             ('test-vm', 'admin.vm.property.GetAll', None, None)] = [
@@ -226,6 +234,100 @@ class TC_00_Properties(qubesadmin.tests.vm.VMTestCase):
         self.assertEqual(self.vm.qid, 3)
         self.assertAllCalled()
 
+    def test_060_clone_properties(self):
+        self.app.expected_calls[
+            ('test-vm', 'admin.vm.property.GetAll', None, None)] = \
+            b'0\x00name default=False type=str test-vm\n' \
+            b'debug default=True type=bool False\n' \
+            b'backup_timestamp default=True type=int \n' \
+            b'kernelopts default=False type=str opt1\\nopt2\\\\opt3\n'
+        self.app.expected_calls[
+            ('test-vm2', 'admin.vm.property.SetMany', None,
+             b'debug False\nkernelopts opt1\\nopt2\\\\opt3\n')] = \
+            b'0\x00'
+        vm2 = self.app.domains.get_blind('test-vm2')
+        vm2.clone_properties(self.vm,
+                             ['debug', 'backup_timestamp', 'kernelopts'])
+        self.assertAllCalled()
+
+    def test_061_clone_properties_fallback(self):
+        self.app.expected_calls[
+            ('test-vm', 'admin.vm.property.GetAll', None, None)] = b''
+        self.app.expected_calls[
+            ('test-vm', 'admin.vm.property.Get', 'debug', None)] = \
+            b'0\x00default=True type=bool False'
+        self.app.expected_calls[
+            ('test-vm2', 'admin.vm.property.SetMany', None,
+             b'debug False\n')] = b''
+        self.app.expected_calls[
+            ('test-vm2', 'admin.vm.property.Set', 'debug', b'False')] = \
+            b'0\x00'
+        vm2 = self.app.domains.get_blind('test-vm2')
+        vm2.clone_properties(self.vm, ['debug'])
+        self.assertAllCalled()
+
+    def test_062_clone_properties_local(self):
+        self.app.expected_calls[
+            ('test-vm', 'admin.vm.property.GetAll', None, None)] = \
+            b'0\x00name default=False type=str test-vm3\n' \
+            b'debug default=True type=bool False\n'
+        self.app.expected_calls[
+            ('test-vm2', 'admin.vm.property.Set', 'name', b'test-vm3')] = \
+            b'0\x00'
+        self.app.expected_calls[
+            ('test-vm3', 'admin.vm.property.SetMany', None,
+             b'debug False\n')] = b'0\x00'
+        vm2 = self.app.domains.get_blind('test-vm2')
+        vm2.clone_properties(self.vm, ['name', 'debug'])
+        self.assertEqual(vm2.name, 'test-vm3')
+        self.assertAllCalled()
+
+    def test_063_clone_properties_error(self):
+        self.app.expected_calls[
+            ('test-vm', 'admin.vm.property.GetAll', None, None)] = \
+            b'0\x00debug default=True type=bool False\n' \
+            b'kernelopts default=False type=str opt1\n'
+        self.app.expected_calls[
+            ('test-vm2', 'admin.vm.property.SetMany', None,
+             b'debug False\nkernelopts opt1\n')] = \
+            b'2\x00QubesException\x00\x00An error occurred\x00'
+        self.app.expected_calls[
+            ('test-vm2', 'admin.vm.property.Set', 'debug', b'False')] = b''
+        self.app.expected_calls[
+            ('test-vm2', 'admin.vm.property.Set', 'kernelopts', b'opt1')] = \
+            b'0\x00'
+        vm2 = self.app.domains.get_blind('test-vm2')
+        vm2.clone_properties(self.vm, ['debug', 'kernelopts'])
+        self.assertAllCalled()
+
+    def test_064_clone_properties_refusal_remembered(self):
+        self.app.expected_calls[
+            ('test-vm', 'admin.vm.property.GetAll', None, None)] = \
+            [b'0\x00debug default=True type=bool False\n'] * 2
+        self.app.expected_calls[
+            ('test-vm2', 'admin.vm.property.SetMany', None,
+             b'debug False\n')] = [b'']
+        self.app.expected_calls[
+            ('test-vm2', 'admin.vm.property.Set', 'debug', b'False')] = \
+            [b'0\x00'] * 2
+        vm2 = self.app.domains.get_blind('test-vm2')
+        vm2.clone_properties(self.vm, ['debug'])
+        vm2.clone_properties(self.vm, ['debug'])
+        self.assertAllCalled()
+
+    def test_065_clone_properties_cached(self):
+        self.app.expected_calls[
+            ('test-vm', 'admin.vm.property.GetAll', None, None)] = \
+            [b'0\x00debug default=True type=bool False\n']
+        self.app.expected_calls[
+            ('test-vm2', 'admin.vm.property.SetMany', None,
+             b'debug False\n')] = b'0\x00'
+        self.app.cache_enabled = True
+        self.assertEqual(self.vm.debug, False)
+        vm2 = self.app.domains.get_blind('test-vm2')
+        vm2.clone_properties(self.vm, ['debug'])
+        self.assertAllCalled()
+
 
 class TC_01_SpecialCases(qubesadmin.tests.vm.VMTestCase):
     def test_000_get_name(self):
@@ -20,6 +20,10 @@
 #
 """ Exits sucessfull if the provided domain(s) exist, else returns failure """
 
+import argparse
+import concurrent.futures
+import functools
+import operator
 import sys
 from argparse import Namespace, ArgumentParser
 from logging import Logger
@@ -82,30 +86,57 @@ class QvmCheckArgumentParser(qubesadmin.tools.QubesArgumentParser):
         self._mutually_exclusive_groups.append(vm_name_group)
 
 
-assert __doc__ is not None
-parser = QvmCheckArgumentParser(description=__doc__)
-parser.add_argument("--running", action="store_true", dest="running",
-                    default=False,
-                    help="Determine if (any of given) VM is running")
-parser.add_argument("--paused", action="store_true", dest="paused",
-                    default=False,
-                    help="Determine if (any of given) VM is paused")
-parser.add_argument("--template", action="store_true", dest="template",
-                    default=False,
-                    help="Determine if (any of given) VM is a template")
-parser.add_argument("--networked", action="store_true", dest="networked",
-                    default=False,
-                    help="Determine if (any of given) VM can reach network")
+def _positive_int(value: str) -> int:
+    """Parse a positive integer command line argument"""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            f"expected a positive integer, got {value!r}")
+    return number
+
+
+@functools.cache
+def get_parser() -> QvmCheckArgumentParser:
+    """Create :py:class:`argparse.ArgumentParser` suitable for
+    :program:`qvm-check` (once, on first use)"""
+    assert __doc__ is not None
+    parser = QvmCheckArgumentParser(description=__doc__)
+    parser.add_argument("--running", action="store_true", dest="running",
+                        default=False,
+                        help="Determine if (any of given) VM is running")
+    parser.add_argument("--paused", action="store_true", dest="paused",
+                        default=False,
+                        help="Determine if (any of given) VM is paused")
+    parser.add_argument("--template", action="store_true", dest="template",
+                        default=False,
+                        help="Determine if (any of given) VM is a template")
+    parser.add_argument("--networked", action="store_true", dest="networked",
+                        default=False,
+                        help="Determine if (any of given) VM can reach network")
+    parser.add_argument("--parallelism", type=_positive_int, metavar="N",
+                        default=None,
+                        help="Check up to N qubes at the same time "
+                             "(default: 4 per qube, up to 32)")
+    return parser
 
 
 def print_msg(log: Logger, domains: Iterable[QubesVM],
               status: list[str]) -> None:
     """Print message in appropriate form about given valid domain(s)"""
+    status_str = ', '.join(status)
     if not domains:
-        log.info("None of qubes: {!s}".format(', '.join(status)))
+        log.info(f"None of qubes: {status_str}")
     else:
-        for vm in sorted(list(domains)):
-            log.info("{!s}: {!s}".format(vm.name, ', '.join(status)))
+        for vm in sorted(domains, key=operator.attrgetter('name')):
+            log.info(f"{vm.name}: {status_str}")
+
+
+def _is_template(vm: QubesVM) -> bool:
+    """Check if *vm* is a template"""
+    return vm.klass == 'TemplateVM'
 
 
 def get_filters(args: Namespace) -> list[dict[str, Any]]: # noqa:ANN401
@@ -113,22 +144,29 @@ def get_filters(args: Namespace) -> list[dict[str, Any]]: # noqa:ANN401
     filters = []
 
     if args.running:
-        filters.append({'status': 'running', 'check': lambda x: x.is_running()})
+        filters.append({'status': 'running',
+                        'check': operator.methodcaller('is_running')})
     if args.paused:
-        filters.append({'status': 'paused', 'check': lambda x: x.is_paused()})
+        filters.append({'status': 'paused',
+                        'check': operator.methodcaller('is_paused')})
     if args.template:
-        filters.append(
-            {'status': 'template', 'check': lambda x: x.klass == 'TemplateVM'})
+        filters.append({'status': 'template', 'check': _is_template})
     if args.networked:
-        filters.append(
-            {'status': 'networked', 'check': lambda x: x.is_networked()})
+        # the only check needing (possibly several) qubesd calls per qube,
+        # others use data already retrieved with the qubes list
+        filters.append({'status': 'networked',
+                        'check': operator.methodcaller('is_networked'),
+                        'concurrent': True})
 
     return filters
 
 
 def main(args: Iterable[str] | None=None, app: QubesBase | None=None) -> int:
     """Main function of qvm-check tool"""
-    args: Namespace = parser.parse_args(args, app=app)
+    args: Namespace = get_parser().parse_args(args, app=app)
+    # use power state reported by admin.vm.List and fetch all the properties
+    # with one Admin API call, instead of issuing one call per check
+    args.app.cache_enabled = True
     domains = args.domains
     invalid_domains = set(args.invalid_domains)
     return_code = 0
@@ -136,17 +174,28 @@ def main(args: Iterable[str] | None=None, app: QubesBase | None=None) -> int:
     log = args.app.log
     log.name = "qvm-check"
 
-    status = []
     filters = get_filters(args)
+    status = [filt['status'] for filt in filters]
     filtered_domains = set(domains)
     if filters:
+        # each filter is applied only to qubes that passed the previous ones
         for filt in filters:
-            status.append(filt['status'])
-            check = filt['check']
-            filtered_domains = filtered_domains.intersection(
-                [vm for vm in domains if check(vm)])
+            if not filtered_domains:
+                break
+            remaining = list(filtered_domains)
+            if filt.get('concurrent'):
+                # checks are independent qubesd calls, don't wait for each
+                # in turn
+                max_workers = args.parallelism or min(32, 4 * len(remaining))
+                with concurrent.futures.ThreadPoolExecutor(
+                        max_workers) as executor:
+                    results = list(executor.map(filt['check'], remaining))
+            else:
+                results = [filt['check'](vm) for vm in remaining]
+            filtered_domains = {
+                vm for vm, passed in zip(remaining, results) if passed}
 
-        if set(domains) & set(filtered_domains) != set(domains):
+        if filtered_domains != set(domains):
             if not filtered_domains:
                 return_code = 1
             else:
@@ -66,7 +66,7 @@ def main(args: Iterable[str] | None=None, app: QubesBase | None=None) -> int:
             parser.error('--unset requires a feature')
 
         try:
-            features = [(feat, vm.features[feat]) for feat in vm.features]
+            features = list(vm.features.items())
             qubesadmin.tools.print_table(features)
         except qubesadmin.exc.QubesException as e:
             parser.error_runtime(str(e))
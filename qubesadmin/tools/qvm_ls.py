@@ -712,22 +712,25 @@ def main(args: Iterable[str] | None=None, app: QubesBase | None=None) -> int:
         spinner.hide()
 
     if args.internal in ['y', 'yes']:
-        domains = [d for d in domains if d.features.get('internal', None)
-                   in ['1', 'true', 'True']]
+        domains = [d for d in domains if d.features.get_raw('internal', None)
+                   in (b'1', b'true', b'True')]
     elif args.internal in ['n', 'no']:
-        domains = [d for d in domains if not d.features.get('internal', None)
-                   in ['1', 'true', 'True']]
+        domains = [d for d in domains
+                   if not d.features.get_raw('internal', None)
+                   in (b'1', b'true', b'True')]
 
     if args.servicevm in ['y', 'yes']:
-        domains = [d for d in domains if d.features.get('servicevm', None)
-                   in ['1', 'true', 'True']]
+        domains = [d for d in domains
+                   if d.features.get_raw('servicevm', None)
+                   in (b'1', b'true', b'True')]
     elif args.servicevm in ['n', 'no']:
-        domains = [d for d in domains if not d.features.get('servicevm', None)
-                   in ['1', 'true', 'True']]
+        domains = [d for d in domains
+                   if not d.features.get_raw('servicevm', None)
+                   in (b'1', b'true', b'True')]
 
     if args.pending_update:
         domains = [d for d in domains if
-                   d.features.get('updates-available', None)]
+                   d.features.get_raw('updates-available', None)]
 
     if args.features:
         # Filter only qubes with specified features
@@ -286,11 +286,11 @@ def run_command_single(args: Namespace,
         service = args.cmd
     elif use_exec:
         all_args = [args.cmd] + args.cmd_args
-        if vm.features.check_with_template("vmexec", False):
+        if vm.features.check_with_template_raw("vmexec", False):
             service = "qubes.VMExec"
             if args.gui and args.dispvm:
                 service = "qubes.VMExecGUI"
-            elif args.user == "root" and vm.features.check_with_template(
+            elif args.user == "root" and vm.features.check_with_template_raw(
                 "supported-rpc.qubes.VMRootExec", False
             ):
                 service = "qubes.VMRootExec"
@@ -307,7 +307,7 @@ def run_command_single(args: Namespace,
         service = "qubes.VMShell"
         if args.gui and args.dispvm:
             service += "+WaitForSession"
-        elif args.user == "root" and vm.features.check_with_template(
+        elif args.user == "root" and vm.features.check_with_template_raw(
                 "supported-rpc.qubes.VMRootExec", False
         ):
             # The above intentionally checks for VMRootExec, not VMRootShell.
@@ -345,7 +345,7 @@ def has_gui(qube: QubesVM) -> bool | object:
     return (
         os.environ.get("DISPLAY") is not None
         and getattr(qube, "guivm", None)
-        and qube.features.check_with_template("gui", True)
+        and qube.features.check_with_template_raw("gui", True)
     )
 
 
@@ -409,7 +409,7 @@ def main(args: Iterable[str] | None=None, app: QubesBase | None=None) -> int:
             vm
             for vm in domains
             if vm.is_running()
-            and not vm.features.get("internal")
+            and not vm.features.get_raw("internal")
             and not vm.is_paused()
         ]
         if args.gui is None:
@@ -100,9 +100,8 @@ def main(args: Iterable[str] | None=None, app: QubesBase | None=None) -> int:
         if args.delete:
             parser.error('--unset requires a feature')
 
-        services = [(feat[len('service.'):],
-            'on' if vm.features[feat] else 'off') for feat in
-            vm.features if feat.startswith('service.')]
+        services = [(feat[len('service.'):], 'on' if value else 'off')
+            for feat, value in vm.features.items('service.')]
         qubesadmin.tools.print_table(services)
 
     elif args.delete:
@@ -47,7 +47,7 @@ def main(args: Iterable[str] | None=None, app: QubesBase | None=None) -> int:
         domains = [
             vm
             for vm in domains
-            if not vm.features.get("internal")
+            if not vm.features.get_raw("internal")
         ]
     for domain in domains:
         try:
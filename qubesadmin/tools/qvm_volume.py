@@ -79,7 +79,7 @@ class VolumeData:
     def __init__(self, volume: Volume):
         self.pool = volume.pool
         self.vid = volume.vid
-        if volume.revisions:
+        if next(volume.iter_revisions(), None) is not None:
             self.revisions = 'Yes'
         else:
             self.revisions = 'No'
@@ -102,7 +102,7 @@ def info_volume(args: Namespace) -> None:
         'snap_on_start', 'size', 'usage', 'revisions_to_keep', 'ephemeral')
     if args.property:
         if args.property == 'revisions':
-            for rev in volume.revisions:
+            for rev in volume.iter_revisions():
                 print(rev)
         elif args.property == 'is_outdated':
             print(volume.is_outdated())
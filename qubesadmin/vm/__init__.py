@@ -86,7 +86,7 @@ class QubesVM(qubesadmin.base.PropertyHolder):
         #  Can we be explicit about it ?
         self.qubesd_call(
             self._method_dest,
-            self._method_prefix + "Set",
+            self._m_set,
             "name",
             str(new_value).encode("utf-8"),
         )
@@ -385,11 +385,11 @@ class QubesVM(qubesadmin.base.PropertyHolder):
         special characters.
 
         """  # pylint: disable=redefined-builtin
-        if self.features.check_with_template("vmexec", False):
+        if self.features.check_with_template_raw("vmexec", False):
             try:
                 service = "qubes.VMExec+"
                 if kwargs.get("user", None) == "root":
-                    if self.features.check_with_template(
+                    if self.features.check_with_template_raw(
                         "supported-rpc.qubes.VMRootExec", False
                     ):
                         kwargs.pop("user")